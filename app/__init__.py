@@ -9,7 +9,9 @@
 # Description:
 # Initialization of the Project Gamma Flask application.
 
+import os
 from flask import Flask
+from jinja2 import FileSystemBytecodeCache
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager
 from config import DevelopmentConfig
@@ -22,9 +24,9 @@ login_manager = LoginManager()
 def create_app(config_object=DevelopmentConfig):
     app = Flask(__name__)
     app.config.from_object(config_object)
-    
-    # Set database URI
-    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///app.db'
+
+    # Database URI comes from the config object (Config defaults to sqlite:///app.db)
+    app.config.setdefault('SQLALCHEMY_DATABASE_URI', 'sqlite:///app.db')
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 
     # Initialize extensions
@@ -33,9 +35,14 @@ def create_app(config_object=DevelopmentConfig):
     login_manager.login_view = 'auth.login'
     login_manager.login_message = 'Please log in to access this page.'
 
+    # Persistent Jinja bytecode cache, must be set before any template loads
+    cache_dir = app.config.get('JINJA_BYTECODE_CACHE_DIR') or os.path.join(app.instance_path, 'jinja_cache')
+    os.makedirs(cache_dir, exist_ok=True)
+    app.jinja_env.bytecode_cache = FileSystemBytecodeCache(cache_dir)
+
     with app.app_context():
         # Import models to register them with SQLAlchemy
-        from .models import User, Favorite
+        from .models import User, Favorite, ObservationChunk
         
         # Create all tables
         db.create_all()
@@ -46,4 +53,12 @@ def create_app(config_object=DevelopmentConfig):
     app.register_blueprint(weather_bp)
     app.register_blueprint(auth_bp)
 
+    # Fingerprinted static assets (see `flask build-assets`)
+    from .utils import assets
+    assets.init_app(app)
+
+    # Opt-in request profiling
+    from .utils import profiling
+    profiling.init_app(app)
+
     return app
\ No newline at end of file
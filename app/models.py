@@ -1,8 +1,8 @@
 # Project Gamma
 #
 # File: models.py
-# Version: 0.1
-# Date: 11/26/25
+# Version: 0.2
+# Date: 10/19/26
 #
 # Author: Ian Seymour / ian.seymour@cwu.edu
 #
@@ -71,6 +71,33 @@ class Favorite(db.Model):
         return f'<Favorite {self.city}>'
 
 
+class ObservationChunk(db.Model):
+    """
+    Append-only block of observations for a single NWS gridpoint.
+
+    Each column is packed into a BLOB as a flat array (see
+    utils/observation_store.py) so a range read decodes a whole chunk at
+    once instead of loading one ORM row per sample. A resolution of 0 marks
+    raw samples; anything else is a downsampled bucket width in seconds.
+    """
+    __tablename__ = 'observation_chunks'
+
+    id = db.Column(db.Integer, primary_key=True)
+    grid_id = db.Column(db.String(32), nullable=False, index=True)
+    resolution = db.Column(db.Integer, nullable=False, default=0)
+    start_ts = db.Column(db.Integer, nullable=False, index=True)
+    end_ts = db.Column(db.Integer, nullable=False)
+    count = db.Column(db.Integer, nullable=False, default=0)
+    timestamps = db.Column(db.LargeBinary, nullable=False, default=b'')
+    temperature = db.Column(db.LargeBinary, nullable=False, default=b'')
+    dewpoint = db.Column(db.LargeBinary, nullable=False, default=b'')
+    precip_prob = db.Column(db.LargeBinary, nullable=False, default=b'')
+    aqi = db.Column(db.LargeBinary, nullable=False, default=b'')
+
+    def __repr__(self):
+        return f'<ObservationChunk {self.grid_id} {self.start_ts}-{self.end_ts} x{self.count}>'
+
+
 @login_manager.user_loader
 def load_user(user_id):
     """Load user by ID for Flask-Login."""
@@ -0,0 +1,165 @@
+const toggleBtn = document.getElementById('toggleSidebarBtn');
+const sidebarCol = document.getElementById('sidebarCol');
+const mainCol = document.getElementById('mainCol');
+const sidebarContent = document.getElementById('sidebarContent');
+const sidebarTitle = document.getElementById('sidebarTitle');
+const icon = document.getElementById('toggleIcon');
+
+toggleBtn.addEventListener('click', function() {
+    if (sidebarContent.classList.contains('d-none')) {
+        // Expand
+        sidebarContent.classList.remove('d-none');
+        sidebarTitle.classList.remove('d-none');
+        
+        // Restore widths
+        sidebarCol.classList.remove('col-auto');
+        sidebarCol.classList.add('col-lg-3');
+        
+        mainCol.classList.remove('col');
+        mainCol.classList.add('col-lg-9');
+        
+        icon.innerHTML = '&laquo;';
+    } else {
+        // Collapse
+        sidebarContent.classList.add('d-none');
+        sidebarTitle.classList.add('d-none');
+        
+        // Shrink sidebar col to fit content
+        sidebarCol.classList.remove('col-lg-3');
+        sidebarCol.classList.add('col-auto');
+        
+        // Expand main col to fill remaining space
+        mainCol.classList.remove('col-lg-9');
+        mainCol.classList.add('col');
+        
+        icon.innerHTML = '&raquo;';
+    }
+});
+
+// Toggle between Farenheit and Celsius
+let isCelsius = false;
+
+function toggleUnits() {
+    isCelsius = !isCelsius;
+    const btn = document.getElementById('unitToggleBtn');
+    const unitLabels = document.querySelectorAll('.unit-label');
+    const tempValues = document.querySelectorAll('.temp-val');
+
+    // Update Button Text
+    btn.textContent = isCelsius ? "Switch to °F" : "Switch to °C";
+
+    // Update Labels
+    unitLabels.forEach(label => {
+        label.textContent = isCelsius ? "C" : "F";
+    });
+
+    // Convert Values
+    tempValues.forEach(el => {
+        const tempF = parseFloat(el.getAttribute('data-temp-f'));
+        if (isNaN(tempF)) return;
+
+        if (isCelsius) {
+            // (F - 32) * 5/9
+            const tempC = Math.round((tempF - 32) * 5 / 9);
+            el.textContent = tempC;
+        } else {
+            // Back to F
+            el.textContent = tempF;
+        }
+    });
+}
+
+// Radar and air quality are loaded after the page so the forecast does not
+// wait on them. Each [data-lazy-panel] element is fetched from the matching
+// data-*-url on #mainCol once it scrolls into view.
+const panelRenderers = {
+    radar: function(el, data) {
+        const title = document.getElementById('radarTitle');
+        const body = document.getElementById('radarBody');
+
+        // Try the loop then the static image of the nearest station, then
+        // the same for each neighbouring station in case a site is down
+        const sources = [];
+        [data].concat(data.fallbacks || []).forEach(function(station) {
+            sources.push({station: station.station_id, url: station.loop_url});
+            sources.push({station: station.station_id, url: station.static_url});
+        });
+
+        const img = document.createElement('img');
+        img.className = 'img-fluid';
+        img.style.cssText = 'max-height: 500px; width: 100%; object-fit: contain;';
+
+        let current = 0;
+        function show(source) {
+            title.textContent = 'Radar (' + source.station + ')';
+            img.alt = 'Radar Loop for ' + source.station;
+            img.src = source.url;
+        }
+        img.onerror = function() {
+            current++;
+            if (current < sources.length) {
+                show(sources[current]);
+            } else {
+                img.onerror = null;
+                panelFailures.radar(el);
+            }
+        };
+
+        show(sources[0]);
+        body.replaceChildren(img);
+    },
+    aqi: function(el, data) {
+        el.textContent = data.AQI + ' ';
+        const label = document.createElement('span');
+        label.style.fontSize = '0.6em';
+        label.textContent = 'AQI';
+        el.appendChild(label);
+        if (data.category) {
+            el.title = data.category;
+        }
+    }
+};
+
+const panelFailures = {
+    radar: function(el) {
+        el.classList.add('d-none');
+    },
+    aqi: function(el) {
+        el.textContent = '--';
+    }
+};
+
+function loadPanel(el) {
+    const name = el.getAttribute('data-lazy-panel');
+    const url = mainCol.getAttribute('data-' + name + '-url');
+    if (!url) return;
+
+    fetch(url, {headers: {'Accept': 'application/json'}})
+        .then(function(response) {
+            if (!response.ok) throw new Error(response.status);
+            return response.json();
+        })
+        .then(function(data) {
+            panelRenderers[name](el, data);
+        })
+        .catch(function() {
+            panelFailures[name](el);
+        });
+}
+
+const lazyPanels = document.querySelectorAll('[data-lazy-panel]');
+if ('IntersectionObserver' in window) {
+    const panelObserver = new IntersectionObserver(function(entries, observer) {
+        entries.forEach(function(entry) {
+            if (entry.isIntersecting) {
+                observer.unobserve(entry.target);
+                loadPanel(entry.target);
+            }
+        });
+    }, {rootMargin: '200px'});
+    lazyPanels.forEach(function(el) {
+        panelObserver.observe(el);
+    });
+} else {
+    lazyPanels.forEach(loadPanel);
+}
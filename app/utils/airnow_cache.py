@@ -0,0 +1,239 @@
+# Project Gamma
+#
+# File: airnow_cache.py
+# Version: 0.1
+# Date: 10/19/26
+#
+# Author: Ian Seymour / ian.seymour@cwu.edu
+#
+# Description:
+# Cache for AirNow observations. AirNow reports once an hour per reporting
+# area, so results are stored per area and kept until the next hourly
+# update. Coordinates are snapped to a grid and each grid cell is mapped to
+# the reporting area that answered for it (or to a nearby known area), so
+# most lookups never reach AirNow. Concurrent misses for the same area wait
+# for a single fetch. Upstream calls are counted against the hourly API key
+# quota with a warning when the threshold is crossed.
+
+import time
+import logging
+import threading
+from typing import Dict, Optional, Tuple, Union
+from flask import current_app
+from .radar_stations import haversine_km
+from .limiter import UpstreamBusy
+
+logger = logging.getLogger(__name__)
+
+
+class _Fetch:
+    """An upstream fetch in progress that other misses can wait on."""
+
+    __slots__ = ('done', 'shed')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.shed = False
+
+
+class AirQualityCache:
+    """In-memory AirNow results keyed by reporting area and snapped coordinates."""
+
+    def __init__(self, grid: float = 0.1, radius_km: float = 25.0, update_offset: int = 1200,
+                 hourly_quota: int = 500, warn_ratio: float = 0.8, wait_timeout: float = 2.0,
+                 max_waiters: int = 16, retry_after: int = 5):
+        self.grid = grid
+        self.radius_km = radius_km
+        self.update_offset = update_offset
+        self.hourly_quota = hourly_quota
+        self.warn_ratio = warn_ratio
+        self.wait_timeout = wait_timeout
+        self.max_waiters = max_waiters
+        self.retry_after = retry_after
+        self.areas = {}     # area key -> {'data', 'latitude', 'longitude', 'expires'}
+        self.cells = {}     # snapped (lat, lon) -> (area key or None, expires)
+        self.inflight = {}  # fetch key -> _Fetch
+        self.waiting = 0    # requests waiting on another request's fetch
+        self.quota_hour = None
+        self.quota_used = 0
+        self._warned = False
+        self._lock = threading.Lock()
+
+    def snap(self, latitude: float, longitude: float) -> Tuple[float, float]:
+        """Snap coordinates to the cache grid."""
+        return (round(round(latitude / self.grid) * self.grid, 4),
+                round(round(longitude / self.grid) * self.grid, 4))
+
+    def next_update(self, now: float) -> float:
+        """Time of the next hourly AirNow update (update_offset seconds past the hour)."""
+        update = now - (now % 3600) + self.update_offset
+        if update <= now:
+            update += 3600
+        return update
+
+    @staticmethod
+    def area_key(observation: Dict) -> str:
+        return f"{observation.get('ReportingArea')}|{observation.get('StateCode')}"
+
+    def _nearby_area(self, latitude: float, longitude: float) -> Optional[str]:
+        """Closest known reporting area within radius_km of a location."""
+        best, best_km = None, self.radius_km
+        for key, area in self.areas.items():
+            km = haversine_km(latitude, longitude, area['latitude'], area['longitude'])
+            if km <= best_km:
+                best, best_km = key, km
+        return best
+
+    def lookup(self, latitude: float, longitude: float, now: Optional[float] = None):
+        """
+        find a cached observation for a location.
+
+        Returns:
+            Tuple of (hit, data, stale). hit is True when data is current (data
+            may be None if AirNow had nothing for this cell). stale is the last
+            expired observation, for use when the quota is exhausted.
+        """
+        now = now if now is not None else time.time()
+        cell = self.snap(latitude, longitude)
+        with self._lock:
+            entry = self.cells.get(cell)
+            if entry is None:
+                key = self._nearby_area(latitude, longitude)
+                if key is None:
+                    return False, None, None
+                entry = (key, None)
+                self.cells[cell] = entry
+
+            key, expires = entry
+            if key is None:
+                # AirNow had no data for this cell, don't ask again until the next update
+                if expires > now:
+                    return True, None, None
+                del self.cells[cell]
+                return False, None, None
+
+            area = self.areas.get(key)
+            if area is None:
+                return False, None, None
+            if area['expires'] > now:
+                return True, area['data'], None
+            return False, None, area['data']
+
+    def store(self, latitude: float, longitude: float, observation: Optional[Dict],
+              now: Optional[float] = None):
+        """Cache an observation (or the lack of one) until the next hourly update."""
+        now = now if now is not None else time.time()
+        expires = self.next_update(now)
+        cell = self.snap(latitude, longitude)
+        with self._lock:
+            if observation is None:
+                self.cells[cell] = (None, expires)
+                return
+            key = self.area_key(observation)
+            self.areas[key] = {
+                'data': observation,
+                'latitude': observation.get('Latitude', latitude),
+                'longitude': observation.get('Longitude', longitude),
+                'expires': expires,
+            }
+            self.cells[cell] = (key, None)
+
+    def fetch_key(self, latitude: float, longitude: float) -> Union[str, Tuple[float, float]]:
+        """Key shared by misses that one fetch can answer: the known reporting area, else the grid cell."""
+        cell = self.snap(latitude, longitude)
+        with self._lock:
+            entry = self.cells.get(cell)
+        if entry and entry[0]:
+            return entry[0]
+        return cell
+
+    def claim(self, key) -> Optional[_Fetch]:
+        """
+        claim the upstream fetch for a key.
+
+        Returns:
+            None if the caller should fetch (and call release when done),
+            otherwise the running fetch to pass to wait()
+
+        Raises:
+            UpstreamBusy if max_waiters requests are already waiting, the
+            waits sit outside the limiter's queue so they are bounded here
+        """
+        with self._lock:
+            fetch = self.inflight.get(key)
+            if fetch is None:
+                self.inflight[key] = _Fetch()
+                return None
+            if self.waiting >= self.max_waiters:
+                raise UpstreamBusy('airnow', self.retry_after)
+            self.waiting += 1
+            return fetch
+
+    def wait(self, fetch: _Fetch) -> bool:
+        """
+        wait up to wait_timeout for a claimed fetch to finish.
+
+        Returns:
+            True if it finished and was not shed by the limiter
+        """
+        try:
+            return fetch.done.wait(self.wait_timeout) and not fetch.shed
+        finally:
+            with self._lock:
+                self.waiting -= 1
+
+    def release(self, key, shed: bool = False):
+        """Finish a claimed fetch and wake everyone waiting on it."""
+        with self._lock:
+            fetch = self.inflight.pop(key, None)
+        if fetch is not None:
+            fetch.shed = shed
+            fetch.done.set()
+
+    def reserve_call(self, now: Optional[float] = None) -> bool:
+        """
+        count an upstream call against the hourly quota.
+
+        Returns:
+            False if the quota for this hour is used up
+        """
+        now = now if now is not None else time.time()
+        hour = int(now // 3600)
+        with self._lock:
+            if hour != self.quota_hour:
+                self.quota_hour = hour
+                self.quota_used = 0
+                self._warned = False
+            if self.quota_used >= self.hourly_quota:
+                return False
+            self.quota_used += 1
+            if not self._warned and self.quota_used >= self.hourly_quota * self.warn_ratio:
+                self._warned = True
+                logger.warning(f"AirNow quota at {self.quota_used}/{self.hourly_quota} calls this hour")
+            return True
+
+    def refund_call(self, now: Optional[float] = None):
+        """Give back a reserved call that never reached AirNow."""
+        now = now if now is not None else time.time()
+        with self._lock:
+            if self.quota_hour == int(now // 3600) and self.quota_used > 0:
+                self.quota_used -= 1
+
+
+def get_airnow_cache() -> AirQualityCache:
+    """Return the app's AirNow cache, creating it from config on first use."""
+    cache = current_app.extensions.get('airnow_cache')
+    if cache is None:
+        config = current_app.config
+        cache = AirQualityCache(
+            grid=config.get('AIRNOW_GRID_DEGREES', 0.1),
+            radius_km=config.get('AIRNOW_AREA_RADIUS_KM', 25.0),
+            update_offset=config.get('AIRNOW_UPDATE_OFFSET', 1200),
+            hourly_quota=config.get('AIRNOW_HOURLY_QUOTA', 500),
+            warn_ratio=config.get('AIRNOW_QUOTA_WARNING', 0.8),
+            wait_timeout=config.get('AIRNOW_WAIT_TIMEOUT') or config.get('UPSTREAM_QUEUE_TIMEOUT', 2.0),
+            max_waiters=config.get('AIRNOW_MAX_WAITERS', 16),
+            retry_after=config.get('UPSTREAM_RETRY_AFTER', 5),
+        )
+        current_app.extensions['airnow_cache'] = cache
+    return cache
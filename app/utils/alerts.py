@@ -0,0 +1,294 @@
+# Project Gamma
+#
+# File: alerts.py
+# Version: 0.2
+# Date: 10/19/26
+#
+# Author: Ian Seymour / ian.seymour@cwu.edu
+#
+# Description:
+# Shared NWS active alert monitor. Locations are mapped to their forecast
+# zone once, and every watched zone is polled together in a few batched
+# /alerts/active?zone=A,B,C requests per cycle by a background thread owned
+# by the app. The thread also watches the zone of every favorite. Results
+# are diffed against the previous cycle and kept in memory, so a location's
+# alerts are read from memory, only a zone that has never been polled costs
+# the request one bounded fetch. Zones nobody has asked about for
+# ALERT_ZONE_TTL are dropped from the watch list.
+
+import time
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional
+from flask import current_app
+from .. import db
+from ..models import Favorite
+from .weather_api import WeatherAPI
+from .limiter import PRIORITY_BACKGROUND
+
+logger = logging.getLogger(__name__)
+
+# Alert fields kept in memory and returned to the client
+ALERT_FIELDS = ('id', 'event', 'headline', 'severity', 'urgency', 'certainty',
+                'areaDesc', 'effective', 'expires', 'sent', 'senderName', 'instruction')
+
+
+def _alert_zones(properties: Dict) -> List[str]:
+    """Zones an alert applies to, from its UGC codes or affectedZones URLs."""
+    zones = properties.get('geocode', {}).get('UGC')
+    if zones:
+        return zones
+    return [url.rstrip('/').rsplit('/', 1)[-1] for url in properties.get('affectedZones', [])]
+
+
+class AlertMonitor:
+    """In-memory view of active alerts for every watched forecast zone."""
+
+    def __init__(self, poll_interval: int = 120, batch_size: int = 25, zone_ttl: int = 21600,
+                 max_zones: int = 2000, max_locations: int = 10000):
+        self.poll_interval = poll_interval
+        self.batch_size = batch_size
+        self.zone_ttl = zone_ttl
+        self.max_zones = max_zones
+        self.max_locations = max_locations
+        self.zones = OrderedDict()           # zone -> last time it was asked for, oldest first
+        self.pending = set()                 # zones waiting for their first fetch
+        self.failed = set()                  # zones never fetched successfully, retried each cycle
+        self.alerts = {}                     # zone -> list of alert dicts
+        self.location_zones = OrderedDict()  # (lat, lon) rounded -> zone, least recently used first
+        self.last_poll = 0.0
+        self.last_diff = {'added': [], 'updated': [], 'removed': []}
+        self._lock = threading.Lock()
+        self._poll_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+
+    @staticmethod
+    def _location_key(latitude: float, longitude: float):
+        # 4 decimals is ~10 m, the same precision NWS accepts for /points
+        return (round(latitude, 4), round(longitude, 4))
+
+    def _forget_zone(self, zone: str):
+        self.zones.pop(zone, None)
+        self.pending.discard(zone)
+        self.failed.discard(zone)
+        self.alerts.pop(zone, None)
+
+    def watch(self, zone: str, queue: bool = True):
+        """
+        Keep a zone on the watch list.
+
+        A zone that has never been polled is queued for the poller, unless
+        queue is False because the caller fetches it itself.
+        """
+        with self._lock:
+            new = zone not in self.zones
+            self.zones[zone] = time.time()
+            self.zones.move_to_end(zone)
+            if new:
+                while len(self.zones) > self.max_zones:
+                    self._forget_zone(next(iter(self.zones)))
+            if not queue or zone in self.alerts or zone in self.pending or zone in self.failed:
+                return
+            self.pending.add(zone)
+        self._wake.set()
+
+    def remember_zone(self, latitude: float, longitude: float, zone: Optional[str]):
+        """Record the zone for a location and start watching it."""
+        if not zone:
+            return
+        with self._lock:
+            key = self._location_key(latitude, longitude)
+            self.location_zones[key] = zone
+            self.location_zones.move_to_end(key)
+            while len(self.location_zones) > self.max_locations:
+                self.location_zones.popitem(last=False)
+        self.watch(zone)
+
+    def zone_for(self, latitude: float, longitude: float, weather_api: WeatherAPI) -> Optional[str]:
+        """Return the zone for a location, resolving it through /points only once."""
+        with self._lock:
+            key = self._location_key(latitude, longitude)
+            zone = self.location_zones.get(key)
+            if zone is not None:
+                self.location_zones.move_to_end(key)
+        if zone is None:
+            zone = weather_api.get_forecast_zone(latitude, longitude)
+            self.remember_zone(latitude, longitude, zone)
+        return zone
+
+    def alerts_for(self, zone: Optional[str], weather_api: Optional[WeatherAPI] = None) -> Optional[List[Dict]]:
+        """
+        get the active alerts for a zone.
+
+        Zones that have been polled are answered from memory. A zone that has
+        never been polled (new, expired, or after a restart) is fetched once
+        with weather_api through the limiter. Without weather_api, or if that
+        fetch fails, the poller is left to fetch it.
+
+        Returns:
+            List of alerts, or None if the zone's alerts are not known yet
+        """
+        if not zone:
+            return []
+        known = zone in self.alerts
+        fetch = not known and weather_api is not None and zone not in self.failed
+        self.watch(zone, queue=not fetch)
+        if fetch:
+            self.poll(weather_api, zones=[zone])
+        return self.alerts.get(zone)
+
+    def seed_favorites(self, weather_api: WeatherAPI) -> int:
+        """
+        watch the forecast zone of every favorite location.
+
+        Locations are resolved through /points once per process, after that
+        this only keeps their zones from expiring.
+
+        Returns:
+            Number of zones watched for favorites
+        """
+        zones = set()
+        locations = db.session.query(Favorite.latitude, Favorite.longitude).distinct().all()
+        for latitude, longitude in locations:
+            zone = self.zone_for(latitude, longitude, weather_api)
+            if zone:
+                self.watch(zone)
+                zones.add(zone)
+        return len(zones)
+
+    def expire(self, now: Optional[float] = None) -> int:
+        """Stop watching zones nobody has asked about within zone_ttl."""
+        now = now if now is not None else time.time()
+        expired = 0
+        with self._lock:
+            while self.zones:
+                zone, seen = next(iter(self.zones.items()))
+                if now - seen < self.zone_ttl:
+                    break
+                self._forget_zone(zone)
+                expired += 1
+        return expired
+
+    def refresh(self, weather_api: WeatherAPI, force: bool = False) -> Optional[Dict]:
+        """
+        poll all watched zones if the last cycle is older than poll_interval,
+        otherwise fetch only zones that are waiting for their first poll.
+
+        Returns:
+            The diff from a full poll, or None if no full poll ran
+        """
+        with self._poll_lock:
+            if force or time.time() - self.last_poll >= self.poll_interval:
+                self.expire()
+                diff = self.poll(weather_api)
+                self.last_poll = time.time()
+                return diff
+            with self._lock:
+                pending = list(self.pending)
+            if pending:
+                self.poll(weather_api, zones=pending)
+            return None
+
+    def poll(self, weather_api: WeatherAPI, zones: Optional[Iterable[str]] = None) -> Dict:
+        """
+        fetch active alerts for zones in batches and diff them against memory.
+
+        Zones whose batch failed keep their previous alerts. Zones that were
+        never fetched are marked failed and tried again next cycle.
+
+        Args:
+            weather_api: API wrapper used for the upstream calls
+            zones: zones to poll, defaults to every watched zone
+
+        Returns:
+            Dictionary of added, updated and removed alert IDs
+        """
+        with self._lock:
+            targets = sorted(zones if zones is not None else self.zones)
+
+        fresh = {zone: [] for zone in targets}
+        polled = set()
+        for start in range(0, len(targets), self.batch_size):
+            batch = targets[start:start + self.batch_size]
+            features = weather_api.get_active_alerts(batch)
+            if features is None:
+                continue
+            polled.update(batch)
+            # An alert covering zones in several batches comes back once per
+            # batch, so each copy only counts for the zones this batch asked for
+            in_batch = set(batch)
+            for feature in features:
+                properties = feature.get('properties', {})
+                alert = {field: properties.get(field) for field in ALERT_FIELDS}
+                for zone in _alert_zones(properties):
+                    if zone in in_batch:
+                        fresh[zone].append(alert)
+
+        with self._lock:
+            old = {a['id']: a for zone in polled for a in self.alerts.get(zone, [])}
+            new = {a['id']: a for zone in polled for a in fresh[zone]}
+            for zone in targets:
+                # Zones dropped from the watch list while polling are not stored
+                if zone not in self.zones:
+                    continue
+                if zone in polled:
+                    self.alerts[zone] = fresh[zone]
+                    self.failed.discard(zone)
+                elif zone not in self.alerts:
+                    self.failed.add(zone)
+                self.pending.discard(zone)
+
+        diff = {
+            'added': sorted(set(new) - set(old)),
+            'updated': sorted(i for i in set(new) & set(old) if new[i]['sent'] != old[i]['sent']),
+            'removed': sorted(set(old) - set(new)),
+        }
+        if zones is None:
+            self.last_diff = diff
+        if diff['added'] or diff['updated'] or diff['removed']:
+            logger.info(f"Alerts changed: {len(diff['added'])} added, "
+                        f"{len(diff['updated'])} updated, {len(diff['removed'])} removed")
+        return diff
+
+    def start(self, app):
+        """Start the background poller for an app, once."""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, args=(app,),
+                                            name='alert-monitor', daemon=True)
+        self._thread.start()
+
+    def _run(self, app):
+        while True:
+            self._wake.clear()
+            with app.app_context():
+                try:
+                    # Polling yields to page views waiting on NWS
+                    weather_api = WeatherAPI(priority=PRIORITY_BACKGROUND)
+                    if time.time() - self.last_poll >= self.poll_interval:
+                        self.seed_favorites(weather_api)
+                    self.refresh(weather_api)
+                except Exception:
+                    logger.exception("Alert poll failed")
+            # Sleep until the next cycle, or until a new zone needs its first fetch
+            self._wake.wait(max(1.0, self.last_poll + self.poll_interval - time.time()))
+
+
+def get_alert_monitor() -> AlertMonitor:
+    """Return the app's alert monitor, creating it and starting its poller on first use."""
+    monitor = current_app.extensions.get('alert_monitor')
+    if monitor is None:
+        config = current_app.config
+        monitor = current_app.extensions.setdefault('alert_monitor', AlertMonitor(
+            poll_interval=config.get('ALERT_POLL_INTERVAL', 120),
+            batch_size=config.get('ALERT_ZONE_BATCH', 25),
+            zone_ttl=config.get('ALERT_ZONE_TTL', 21600),
+            max_zones=config.get('ALERT_MAX_ZONES', 2000),
+            max_locations=config.get('ALERT_MAX_LOCATIONS', 10000),
+        ))
+        if config.get('ALERT_POLLING_ENABLED', True):
+            monitor.start(current_app._get_current_object())
+    return monitor
@@ -0,0 +1,188 @@
+# Project Gamma
+#
+# File: assets.py
+# Version: 0.1
+# Date: 10/19/26
+#
+# Author: Ian Seymour / ian.seymour@cwu.edu
+#
+# Description:
+# Static asset pipeline. `flask build-assets` minifies the CSS/JS under
+# app/static, writes content-hashed copies (plus gzip/brotli variants) to
+# app/static/dist and records them in a manifest. Templates call asset_url()
+# to get the hashed name, which is served with a one-year immutable
+# Cache-Control header. Without a build, asset_url() falls back to the
+# regular static URL so development works unchanged.
+
+import os
+import re
+import gzip
+import json
+import hashlib
+import mimetypes
+import click
+from flask import current_app, request, send_from_directory, url_for, abort
+
+# brotli is in requirements.txt, but a build without it still produces gzip
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Source files (relative to app/static) processed by the build
+ASSET_SOURCES = ('css/style.css', 'js/dashboard.js')
+
+DIST_FOLDER = 'dist'
+MANIFEST_NAME = 'manifest.json'
+
+# Hashed names never change content, so clients may cache them for a year
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+# Precompressed variants, in order of preference
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+
+def minify_css(source: str) -> str:
+    """Strip comments and whitespace from a stylesheet."""
+    source = re.sub(r'/\*.*?\*/', '', source, flags=re.S)
+    source = re.sub(r'\s+', ' ', source)
+    source = re.sub(r'\s*([{};,>])\s*', r'\1', source)
+    # Only trailing space after ':' is dropped, 'a :hover' is a different selector
+    source = re.sub(r':\s+', ':', source)
+    source = source.replace(';}', '}')
+    return source.strip()
+
+
+def minify_js(source: str) -> str:
+    """
+    Conservatively shrink a script.
+
+    Only whole-line comments, indentation and blank lines are removed so
+    strings, regexes and inline comments can never be broken.
+    """
+    lines = []
+    for line in source.splitlines():
+        line = line.strip()
+        if not line or line.startswith('//'):
+            continue
+        lines.append(line)
+    return '\n'.join(lines)
+
+
+MINIFIERS = {
+    '.css': minify_css,
+    '.js': minify_js,
+}
+
+
+def _dist_path(app) -> str:
+    return os.path.join(app.static_folder, DIST_FOLDER)
+
+
+def load_manifest(app) -> dict:
+    """Read the manifest written by the last build, or an empty dict if none exists."""
+    path = os.path.join(_dist_path(app), MANIFEST_NAME)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def build_assets(app) -> dict:
+    """
+    minify, hash and precompress every file in ASSET_SOURCES.
+
+    Args:
+        app: the Flask application whose static folder is processed
+
+    Returns:
+        The new manifest mapping source names to hashed names
+    """
+    dist = _dist_path(app)
+    os.makedirs(dist, exist_ok=True)
+    manifest = {}
+
+    for source in ASSET_SOURCES:
+        src_path = os.path.join(app.static_folder, source)
+        with open(src_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+
+        base, ext = os.path.splitext(source)
+        minify = MINIFIERS.get(ext)
+        if minify:
+            content = minify(content)
+        data = content.encode('utf-8')
+
+        digest = hashlib.sha256(data).hexdigest()[:12]
+        hashed = f"{base}.{digest}{ext}"
+        out_path = os.path.join(dist, hashed)
+        os.makedirs(os.path.dirname(out_path), exist_ok=True)
+
+        with open(out_path, 'wb') as f:
+            f.write(data)
+        with open(out_path + '.gz', 'wb') as f:
+            f.write(gzip.compress(data, compresslevel=9, mtime=0))
+        if brotli is not None:
+            with open(out_path + '.br', 'wb') as f:
+                f.write(brotli.compress(data))
+
+        manifest[source] = hashed
+
+    with open(os.path.join(dist, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+    return manifest
+
+
+def asset_url(filename: str) -> str:
+    """Return the hashed URL for a static asset, or the plain static URL if unbuilt."""
+    hashed = current_app.extensions.get('assets', {}).get(filename)
+    if hashed:
+        return url_for('assets', filename=hashed)
+    return url_for('static', filename=filename)
+
+
+def serve_asset(filename):
+    """Serve a hashed asset, preferring a precompressed variant the client accepts."""
+    # Only hashed names may be cached forever, so the manifest itself is not served
+    if filename not in current_app.extensions.get('assets', {}).values():
+        abort(404)
+    dist = _dist_path(current_app)
+    if not os.path.isfile(os.path.join(dist, filename)):
+        abort(404)
+
+    mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    # Parsed header, so q=0 (explicitly refused) counts as not accepted
+    accepted = request.accept_encodings
+
+    encoding = None
+    name = filename
+    for candidate, suffix in ENCODINGS:
+        if accepted[candidate] > 0 and os.path.isfile(os.path.join(dist, filename + suffix)):
+            encoding = candidate
+            name = filename + suffix
+            break
+
+    response = send_from_directory(dist, name, mimetype=mimetype, max_age=31536000)
+    response.headers['Cache-Control'] = IMMUTABLE_CACHE_CONTROL
+    response.headers.pop('Content-Disposition', None)
+    response.vary.add('Accept-Encoding')
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    return response
+
+
+def init_app(app):
+    """Register the asset route, template helper and build command."""
+    app.extensions['assets'] = load_manifest(app)
+    app.add_url_rule(f'/static/{DIST_FOLDER}/<path:filename>', 'assets', serve_asset)
+    app.add_template_global(asset_url)
+
+    @app.cli.command('build-assets')
+    def build_assets_command():
+        """Minify, fingerprint and precompress static assets."""
+        manifest = build_assets(app)
+        app.extensions['assets'] = manifest
+        for source, hashed in manifest.items():
+            click.echo(f"{source} -> {DIST_FOLDER}/{hashed}")
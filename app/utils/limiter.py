@@ -0,0 +1,144 @@
+# Project Gamma
+#
+# File: limiter.py
+# Version: 0.1
+# Date: 10/19/26
+#
+# Author: Ian Seymour / ian.seymour@cwu.edu
+#
+# Description:
+# Per-upstream concurrency limits. Each upstream (NWS, AirNow, Nominatim)
+# allows a fixed number of requests in flight plus a bounded wait queue.
+# Waiters are served by priority, interactive page views before background
+# jobs. When the queue is full, or a waiter times out, UpstreamBusy is raised
+# so the weather views can answer 503 with Retry-After straight away instead
+# of parking another worker on a slow upstream.
+
+import heapq
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from flask import current_app
+
+# Lower numbers are served first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 10
+
+# (max in flight, max waiting) used for upstreams missing from UPSTREAM_LIMITS
+DEFAULT_LIMIT = (8, 16)
+
+# How each upstream is named on the busy page
+UPSTREAM_NAMES = {
+    'nws': 'the National Weather Service',
+    'airnow': 'AirNow',
+    'nominatim': 'the location search service',
+}
+
+
+class UpstreamBusy(Exception):
+    """Raised when an upstream has no free slot within the wait budget."""
+
+    def __init__(self, upstream: str, retry_after: int):
+        super().__init__(f"{upstream} is busy, retry after {retry_after}s")
+        self.upstream = upstream
+        self.retry_after = retry_after
+
+    @property
+    def service_name(self) -> str:
+        return UPSTREAM_NAMES.get(self.upstream, 'an upstream service')
+
+
+class UpstreamLimiter:
+    """Counting semaphore with a bounded, prioritized wait queue."""
+
+    def __init__(self, name: str, max_concurrent: int, max_queue: int,
+                 timeout: float = 2.0, retry_after: int = 5):
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.retry_after = retry_after
+        self.active = 0
+        self._waiting = []
+        self._counter = itertools.count()
+        self._cond = threading.Condition()
+
+    def _busy(self):
+        return UpstreamBusy(self.name, self.retry_after)
+
+    def acquire(self, priority: int = PRIORITY_INTERACTIVE):
+        """
+        take a slot, waiting in priority order if all are in use.
+
+        Background callers may only use half of the queue so interactive
+        requests can still get in line when background jobs pile up.
+
+        Raises:
+            UpstreamBusy if the queue is full or no slot frees up in time
+        """
+        with self._cond:
+            if self.active < self.max_concurrent and not self._waiting:
+                self.active += 1
+                return
+
+            queue_limit = self.max_queue
+            if priority >= PRIORITY_BACKGROUND:
+                queue_limit = self.max_queue // 2
+            if len(self._waiting) >= queue_limit:
+                raise self._busy()
+
+            entry = (priority, next(self._counter))
+            heapq.heappush(self._waiting, entry)
+            deadline = time.monotonic() + self.timeout
+
+            while True:
+                if self.active < self.max_concurrent and self._waiting[0] == entry:
+                    heapq.heappop(self._waiting)
+                    self.active += 1
+                    # The next waiter may be able to go as well
+                    self._cond.notify_all()
+                    return
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._waiting.remove(entry)
+                    heapq.heapify(self._waiting)
+                    self._cond.notify_all()
+                    raise self._busy()
+                self._cond.wait(remaining)
+
+    def release(self):
+        with self._cond:
+            self.active -= 1
+            self._cond.notify_all()
+
+    @contextmanager
+    def slot(self, priority: int = PRIORITY_INTERACTIVE):
+        """Hold a slot for the duration of the block."""
+        self.acquire(priority)
+        try:
+            yield
+        finally:
+            self.release()
+
+
+_create_lock = threading.Lock()
+
+
+def get_limiter(upstream: str) -> UpstreamLimiter:
+    """Return the shared limiter for an upstream, creating it from config on first use."""
+    limiters = current_app.extensions.setdefault('upstream_limiters', {})
+    limiter = limiters.get(upstream)
+    if limiter is None:
+        with _create_lock:
+            limiter = limiters.get(upstream)
+            if limiter is None:
+                config = current_app.config
+                max_concurrent, max_queue = config.get('UPSTREAM_LIMITS', {}).get(upstream, DEFAULT_LIMIT)
+                limiter = UpstreamLimiter(
+                    upstream, max_concurrent, max_queue,
+                    timeout=config.get('UPSTREAM_QUEUE_TIMEOUT', 2.0),
+                    retry_after=config.get('UPSTREAM_RETRY_AFTER', 5),
+                )
+                limiters[upstream] = limiter
+    return limiter
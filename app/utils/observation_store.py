@@ -0,0 +1,312 @@
+# Project Gamma
+#
+# File: observation_store.py
+# Version: 0.1
+# Date: 10/19/26
+#
+# Author: Ian Seymour / ian.seymour@cwu.edu
+#
+# Description:
+# Append-only, columnar observation store for favorite gridpoints. Samples are
+# packed into flat arrays and saved as BLOBs on ObservationChunk rows so trend
+# queries decode whole chunks at once. Old chunks are downsampled into coarser
+# resolutions according to OBSERVATION_RETENTION.
+
+import time
+import logging
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, Optional
+from flask import current_app
+from .. import db
+from ..models import ObservationChunk
+
+logger = logging.getLogger(__name__)
+
+# Value columns stored for every sample (timestamps are kept separately)
+COLUMNS = ('temperature', 'dewpoint', 'precip_prob', 'aqi')
+
+# Array typecodes: 64-bit ints for epoch seconds, doubles for values
+TS_TYPE = 'q'
+VALUE_TYPE = 'd'
+
+# Missing values are stored as NaN so every column stays the same length
+MISSING = float('nan')
+
+AGGREGATES = ('mean', 'min', 'max', 'last')
+
+# Most buckets a single trend query may ask for
+MAX_BUCKETS = 10000
+
+
+def make_grid_id(office: str, grid_x: int, grid_y: int) -> str:
+    """Build the gridpoint key used by the store, e.g. 'SEW/124,67'."""
+    return f"{office}/{grid_x},{grid_y}"
+
+
+def _unpack(blob: bytes, typecode: str) -> array:
+    """Decode a BLOB column back into an array."""
+    values = array(typecode)
+    if blob:
+        values.frombytes(blob)
+    return values
+
+
+def _clean(value) -> float:
+    """Coerce a sample value to float, using NaN for anything missing."""
+    if value is None:
+        return MISSING
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return MISSING
+
+
+def _reduce(values: array, func: str) -> Optional[float]:
+    """Apply an aggregate to a column slice, skipping missing samples."""
+    present = [v for v in values if v == v]
+    if not present:
+        return None
+    if func == 'min':
+        return min(present)
+    if func == 'max':
+        return max(present)
+    if func == 'last':
+        return present[-1]
+    return round(sum(present) / len(present), 2)
+
+
+class ObservationStore:
+    """Read and write columnar observation chunks for NWS gridpoints."""
+
+    def __init__(self):
+        """Load chunking and retention settings from the app config."""
+        config = current_app.config
+        self.chunk_size = config.get('OBSERVATION_CHUNK_SIZE', 256)
+        self.min_interval = config.get('OBSERVATION_MIN_INTERVAL', 600)
+        self.retention = config.get('OBSERVATION_RETENTION', ())
+
+    def append(self, grid_id: str, temperature=None, dewpoint=None,
+               precip_prob=None, aqi=None, timestamp: Optional[int] = None) -> bool:
+        """
+        append one sample to the newest raw chunk for a gridpoint.
+
+        Args:
+            grid_id: gridpoint key from make_grid_id
+            temperature, dewpoint, precip_prob, aqi: sample values (None if missing)
+            timestamp: epoch seconds, defaults to now
+
+        Returns:
+            True if the sample was stored, False if it was too close to the last one
+        """
+        ts = int(timestamp if timestamp is not None else time.time())
+
+        chunk = (ObservationChunk.query
+                 .filter_by(grid_id=grid_id, resolution=0)
+                 .order_by(ObservationChunk.start_ts.desc())
+                 .first())
+
+        # Page views are frequent, so only keep one sample per interval
+        if chunk and ts - chunk.end_ts < self.min_interval:
+            return False
+
+        if chunk is None or chunk.count >= self.chunk_size:
+            chunk = ObservationChunk(grid_id=grid_id, resolution=0, start_ts=ts,
+                                     end_ts=ts, count=0, timestamps=b'',
+                                     temperature=b'', dewpoint=b'',
+                                     precip_prob=b'', aqi=b'')
+            db.session.add(chunk)
+
+        sample = {
+            'temperature': temperature,
+            'dewpoint': dewpoint,
+            'precip_prob': precip_prob,
+            'aqi': aqi,
+        }
+
+        chunk.timestamps = chunk.timestamps + array(TS_TYPE, [ts]).tobytes()
+        for column in COLUMNS:
+            packed = array(VALUE_TYPE, [_clean(sample[column])]).tobytes()
+            setattr(chunk, column, getattr(chunk, column) + packed)
+        chunk.end_ts = ts
+        chunk.count += 1
+
+        db.session.commit()
+        return True
+
+    def read(self, grid_id: str, start: int, end: int) -> Dict[str, array]:
+        """
+        read every sample for a gridpoint between start and end (inclusive).
+
+        Args:
+            grid_id: gridpoint key
+            start, end: epoch seconds
+
+        Returns:
+            Dictionary of column name to array, including 'timestamp'
+        """
+        chunks = (ObservationChunk.query
+                  .filter(ObservationChunk.grid_id == grid_id,
+                          ObservationChunk.end_ts >= start,
+                          ObservationChunk.start_ts <= end)
+                  .order_by(ObservationChunk.start_ts)
+                  .all())
+
+        result = {'timestamp': array(TS_TYPE)}
+        for column in COLUMNS:
+            result[column] = array(VALUE_TYPE)
+
+        for chunk in chunks:
+            timestamps = _unpack(chunk.timestamps, TS_TYPE)
+            # Chunks are sorted, so bisect once per chunk instead of testing each sample
+            lo = bisect_left(timestamps, start)
+            hi = bisect_right(timestamps, end)
+            if lo >= hi:
+                continue
+            result['timestamp'].extend(timestamps[lo:hi])
+            for column in COLUMNS:
+                result[column].extend(_unpack(getattr(chunk, column), VALUE_TYPE)[lo:hi])
+
+        return result
+
+    def aggregate(self, grid_id: str, start: int, end: int,
+                  bucket: int = 3600, func: str = 'mean') -> List[Dict]:
+        """
+        aggregate samples into fixed-width time buckets.
+
+        Args:
+            grid_id: gridpoint key
+            start, end: epoch seconds
+            bucket: bucket width in seconds
+            func: one of AGGREGATES
+
+        Returns:
+            List of dictionaries with the bucket start time and one value per column
+        """
+        data = self.read(grid_id, start, end)
+        timestamps = data['timestamp']
+        buckets = []
+        if not timestamps:
+            return buckets
+
+        lo = 0
+        while lo < len(timestamps):
+            # Jump straight to the next occupied bucket, empty ones are skipped
+            edge = timestamps[lo] - (timestamps[lo] % bucket)
+            hi = bisect_left(timestamps, edge + bucket, lo)
+            entry = {'timestamp': edge}
+            for column in COLUMNS:
+                entry[column] = _reduce(data[column][lo:hi], func)
+            buckets.append(entry)
+            lo = hi
+
+        return buckets
+
+    def summary(self, grid_id: str, start: int, end: int) -> Dict:
+        """
+        summarize each column over a range.
+
+        Returns:
+            Dictionary of column name to its min, max, mean and last value
+        """
+        data = self.read(grid_id, start, end)
+        summary = {'count': len(data['timestamp'])}
+        for column in COLUMNS:
+            summary[column] = {func: _reduce(data[column], func) for func in AGGREGATES}
+        return summary
+
+    def compact(self, now: Optional[int] = None) -> int:
+        """
+        downsample chunks that have aged out of their retention tier.
+
+        Each (resolution, max_age) tier in OBSERVATION_RETENTION is rolled into
+        the next tier's resolution once older than max_age. Chunks older than the
+        last tier are deleted. Only whole target buckets are downsampled, samples
+        in a bucket that may still get more data are kept for the next run.
+
+        Returns:
+            Number of chunks removed or rewritten
+        """
+        now = int(now if now is not None else time.time())
+        changed = 0
+
+        for index, (resolution, max_age) in enumerate(self.retention):
+            cutoff = now - max_age
+            expired = (ObservationChunk.query
+                       .filter(ObservationChunk.resolution == resolution,
+                               ObservationChunk.end_ts < cutoff)
+                       .order_by(ObservationChunk.grid_id, ObservationChunk.start_ts)
+                       .all())
+            if not expired:
+                continue
+
+            if index + 1 < len(self.retention):
+                target = self.retention[index + 1][0]
+                by_grid = {}
+                for chunk in expired:
+                    by_grid.setdefault(chunk.grid_id, []).append(chunk)
+                for grid_id, chunks in by_grid.items():
+                    # Later samples at this resolution start at the oldest chunk still kept
+                    later = (ObservationChunk.query
+                             .filter(ObservationChunk.grid_id == grid_id,
+                                     ObservationChunk.resolution == resolution,
+                                     ObservationChunk.end_ts >= cutoff)
+                             .order_by(ObservationChunk.start_ts)
+                             .first())
+                    boundary = min(cutoff, later.start_ts) if later else cutoff
+                    self._downsample(grid_id, chunks, resolution, target, boundary)
+
+            for chunk in expired:
+                db.session.delete(chunk)
+            changed += len(expired)
+
+        db.session.commit()
+        if changed:
+            logger.info(f"Compacted {changed} observation chunks")
+        return changed
+
+    def _downsample(self, grid_id: str, chunks: List[ObservationChunk], resolution: int,
+                    target: int, boundary: int):
+        """
+        Average a run of chunks into new chunks at a coarser resolution.
+
+        Buckets that end after boundary could still receive samples, so their
+        samples are written back at the original resolution instead. This keeps
+        each target bucket to a single row across compaction runs.
+        """
+        timestamps = array(TS_TYPE)
+        columns = {column: array(VALUE_TYPE) for column in COLUMNS}
+        for chunk in chunks:
+            timestamps.extend(_unpack(chunk.timestamps, TS_TYPE))
+            for column in COLUMNS:
+                columns[column].extend(_unpack(getattr(chunk, column), VALUE_TYPE))
+
+        whole = bisect_left(timestamps, boundary - (boundary % target))
+
+        out_ts = array(TS_TYPE)
+        out_cols = {column: array(VALUE_TYPE) for column in COLUMNS}
+        lo = 0
+        while lo < whole:
+            edge = timestamps[lo] - (timestamps[lo] % target)
+            hi = bisect_left(timestamps, edge + target, lo, whole)
+            out_ts.append(edge)
+            for column in COLUMNS:
+                value = _reduce(columns[column][lo:hi], 'mean')
+                out_cols[column].append(MISSING if value is None else value)
+            lo = hi
+
+        self._write_chunks(grid_id, target, out_ts, out_cols)
+        self._write_chunks(grid_id, resolution, timestamps[whole:],
+                           {column: columns[column][whole:] for column in COLUMNS})
+
+    def _write_chunks(self, grid_id: str, resolution: int, timestamps: array, columns: Dict[str, array]):
+        """Add chunk rows holding the given samples, chunk_size samples per row."""
+        for offset in range(0, len(timestamps), self.chunk_size):
+            part = slice(offset, offset + self.chunk_size)
+            part_ts = timestamps[part]
+            chunk = ObservationChunk(grid_id=grid_id, resolution=resolution,
+                                     start_ts=part_ts[0], end_ts=part_ts[-1],
+                                     count=len(part_ts), timestamps=part_ts.tobytes())
+            for column in COLUMNS:
+                setattr(chunk, column, columns[column][part].tobytes())
+            db.session.add(chunk)
@@ -0,0 +1,278 @@
+# Project Gamma
+#
+# File: profiling.py
+# Version: 0.1
+# Date: 10/19/26
+#
+# Author: Ian Seymour / ian.seymour@cwu.edu
+#
+# Description:
+# Opt-in, per-request profiling. A request is profiled when it carries a
+# signed X-Profile-Token header, when an admin adds ?_profile=1, or when it
+# is picked by PROFILE_SAMPLE_RATE. A background thread samples the request
+# thread's stack and the samples are written as collapsed stacks (one
+# "frame;frame;frame count" line per stack, ready for flamegraph.pl or
+# speedscope) next to a JSON file with a timeline of WeatherAPI spans.
+# Recent profiles are listed at /_profiles.
+
+import os
+import sys
+import json
+import time
+import uuid
+import random
+import logging
+import threading
+import functools
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+import click
+from flask import current_app, g, request, has_request_context, render_template, send_from_directory, abort
+from flask_login import current_user, login_required
+from itsdangerous import URLSafeTimedSerializer, BadSignature
+
+logger = logging.getLogger(__name__)
+
+TOKEN_HEADER = 'X-Profile-Token'
+QUERY_FLAG = '_profile'
+TOKEN_SALT = 'request-profile'
+
+# Frames from these modules are noise in every stack, so drop them
+SKIPPED_FRAMES = ('threading.py',)
+
+
+def _frame_label(code) -> str:
+    """Label a frame as 'function (package/file.py:line)'."""
+    path = code.co_filename.replace('\\', '/').split('/')
+    return f"{code.co_name} ({'/'.join(path[-2:])}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """Samples another thread's call stack on a fixed interval."""
+
+    def __init__(self, thread_id: int, interval: float = 0.005):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='gamma-profiler', daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                if not code.co_filename.endswith(SKIPPED_FRAMES):
+                    stack.append(_frame_label(code))
+                frame = frame.f_back
+            if stack:
+                self.stacks[';'.join(reversed(stack))] += 1
+
+    def collapsed(self) -> str:
+        """Return the samples in collapsed-stack format."""
+        return '\n'.join(f"{stack} {count}" for stack, count in self.stacks.most_common()) + '\n'
+
+
+class RequestProfile:
+    """Profiling state for a single request."""
+
+    def __init__(self, reason: str, interval: float):
+        self.id = f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        self.reason = reason
+        self.started = time.perf_counter()
+        self.spans = []
+        self.depth = 0
+        self.sampler = StackSampler(threading.get_ident(), interval)
+
+
+@contextmanager
+def span(name: str):
+    """Record a timed span on the current request's profile, if there is one."""
+    profile = g.get('_profile') if has_request_context() else None
+    if profile is None:
+        yield
+        return
+
+    start = time.perf_counter()
+    profile.depth += 1
+    try:
+        yield
+    finally:
+        profile.depth -= 1
+        profile.spans.append({
+            'name': name,
+            'depth': profile.depth,
+            'start_ms': round((start - profile.started) * 1000, 2),
+            'duration_ms': round((time.perf_counter() - start) * 1000, 2),
+        })
+
+
+def traced(name: str):
+    """Decorator form of span()."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _serializer():
+    return URLSafeTimedSerializer(current_app.config['SECRET_KEY'])
+
+
+def make_token() -> str:
+    """Create a signed token that enables profiling via the X-Profile-Token header."""
+    return _serializer().dumps('profile', salt=TOKEN_SALT)
+
+
+def _token_valid(token: str) -> bool:
+    max_age = current_app.config.get('PROFILE_TOKEN_MAX_AGE', 86400)
+    try:
+        return _serializer().loads(token, salt=TOKEN_SALT, max_age=max_age) == 'profile'
+    except BadSignature:
+        return False
+
+
+def is_profile_admin() -> bool:
+    """Check whether the logged in user may request and browse profiles."""
+    admins = current_app.config.get('PROFILE_ADMINS', ())
+    return current_user.is_authenticated and current_user.email in admins
+
+
+def _profile_dir(app) -> str:
+    return app.config.get('PROFILE_DIR') or os.path.join(app.instance_path, 'profiles')
+
+
+def _profile_reason():
+    """Decide whether this request should be profiled and why."""
+    token = request.headers.get(TOKEN_HEADER)
+    if token and _token_valid(token):
+        return 'token'
+    if request.args.get(QUERY_FLAG) and is_profile_admin():
+        return 'admin'
+    rate = current_app.config.get('PROFILE_SAMPLE_RATE', 0.0)
+    if rate and random.random() < rate:
+        return 'sampled'
+    return None
+
+
+def _start_profile():
+    if not current_app.config.get('PROFILING_ENABLED') or request.endpoint == 'static':
+        return
+    reason = _profile_reason()
+    if reason:
+        profile = RequestProfile(reason, current_app.config.get('PROFILE_INTERVAL', 0.005))
+        g._profile = profile
+        profile.sampler.start()
+
+
+def _finish_profile(response):
+    profile = g.pop('_profile', None)
+    if profile is None:
+        return response
+
+    profile.sampler.stop()
+    duration_ms = round((time.perf_counter() - profile.started) * 1000, 2)
+
+    try:
+        directory = _profile_dir(current_app)
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, f"{profile.id}.folded"), 'w', encoding='utf-8') as f:
+            f.write(profile.sampler.collapsed())
+        with open(os.path.join(directory, f"{profile.id}.json"), 'w', encoding='utf-8') as f:
+            json.dump({
+                'id': profile.id,
+                'method': request.method,
+                'path': request.full_path.rstrip('?'),
+                'endpoint': request.endpoint,
+                'status': response.status_code,
+                'reason': profile.reason,
+                'duration_ms': duration_ms,
+                'samples': sum(profile.sampler.stacks.values()),
+                'spans': sorted(profile.spans, key=lambda s: s['start_ms']),
+            }, f, indent=2)
+        _prune(directory, current_app.config.get('PROFILE_KEEP', 100))
+    except OSError as e:
+        logger.error(f"Error writing profile {profile.id}: {e}")
+        return response
+
+    response.headers['X-Profile-Id'] = profile.id
+    return response
+
+
+def _abandon_profile(exc=None):
+    """Make sure the sampler thread stops even if after_request never ran."""
+    profile = g.pop('_profile', None)
+    if profile is not None:
+        profile.sampler.stop()
+
+
+def _prune(directory: str, keep: int):
+    """Delete all but the newest `keep` profiles."""
+    ids = sorted({name.rsplit('.', 1)[0] for name in os.listdir(directory)}, reverse=True)
+    for stale in ids[keep:]:
+        for ext in ('.folded', '.json'):
+            try:
+                os.remove(os.path.join(directory, stale + ext))
+            except OSError:
+                pass
+
+
+def load_profiles(app, limit: int = 100):
+    """Read the metadata of the most recent profiles, newest first."""
+    directory = _profile_dir(app)
+    if not os.path.isdir(directory):
+        return []
+    profiles = []
+    for name in sorted(os.listdir(directory), reverse=True):
+        if not name.endswith('.json'):
+            continue
+        try:
+            with open(os.path.join(directory, name), 'r', encoding='utf-8') as f:
+                profiles.append(json.load(f))
+        except (OSError, ValueError):
+            continue
+        if len(profiles) >= limit:
+            break
+    return profiles
+
+
+@login_required
+def profile_index():
+    """List recent profiles."""
+    if not is_profile_admin():
+        abort(404)
+    return render_template('profiling/index.html', profiles=load_profiles(current_app))
+
+
+@login_required
+def profile_file(filename):
+    """Download a collapsed-stack or span file."""
+    if not is_profile_admin() or not filename.endswith(('.folded', '.json')):
+        abort(404)
+    return send_from_directory(_profile_dir(current_app), filename, mimetype='text/plain')
+
+
+def init_app(app):
+    """Register the profiling hooks, index page and token command."""
+    app.before_request(_start_profile)
+    app.after_request(_finish_profile)
+    app.teardown_request(_abandon_profile)
+    app.add_url_rule('/_profiles/', 'profile_index', profile_index)
+    app.add_url_rule('/_profiles/<path:filename>', 'profile_file', profile_file)
+
+    @app.cli.command('profile-token')
+    def profile_token_command():
+        """Print a signed X-Profile-Token value."""
+        click.echo(make_token())
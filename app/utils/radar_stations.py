@@ -0,0 +1,203 @@
+# Project Gamma
+#
+# File: radar_stations.py
+# Version: 0.1
+# Date: 10/19/26
+#
+# Author: Ian Seymour / ian.seymour@cwu.edu
+#
+# Description:
+# Local nearest radar station lookup. The NEXRAD site list is small and
+# fixed, so it is bundled in data/radar_stations.csv and indexed with a
+# KD-tree instead of asking NWS /points for the radarStation every time.
+# Stations are placed on the unit sphere in 3D, where straight-line (chord)
+# distance orders points the same way as great-circle distance, so the
+# KD-tree nearest neighbour is also the haversine nearest neighbour.
+
+import os
+import csv
+import json
+import math
+import heapq
+import threading
+from typing import Dict, List, Optional, Tuple
+
+STATIONS_FILE = os.path.join(os.path.dirname(__file__), 'data', 'radar_stations.csv')
+
+EARTH_RADIUS_KM = 6371.0
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance between two points in kilometers."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlmb = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlmb / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def _to_xyz(latitude: float, longitude: float) -> Tuple[float, float, float]:
+    """Convert latitude/longitude to a point on the unit sphere."""
+    phi = math.radians(latitude)
+    lmb = math.radians(longitude)
+    return (math.cos(phi) * math.cos(lmb), math.cos(phi) * math.sin(lmb), math.sin(phi))
+
+
+class _Node:
+    __slots__ = ('point', 'index', 'axis', 'left', 'right')
+
+    def __init__(self, point, index, axis, left, right):
+        self.point = point
+        self.index = index
+        self.axis = axis
+        self.left = left
+        self.right = right
+
+
+class RadarStationIndex:
+    """KD-tree of radar stations supporting k-nearest lookups."""
+
+    def __init__(self, stations: List[Dict]):
+        self.stations = stations
+        points = [(_to_xyz(s['latitude'], s['longitude']), i) for i, s in enumerate(stations)]
+        self._root = self._build(points, 0)
+
+    @classmethod
+    def from_csv(cls, path: str = STATIONS_FILE) -> 'RadarStationIndex':
+        """Load the bundled station table."""
+        stations = []
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            for row in csv.DictReader(f):
+                stations.append({
+                    'station_id': row['station_id'],
+                    'name': row['name'],
+                    'state': row['state'],
+                    'latitude': float(row['latitude']),
+                    'longitude': float(row['longitude']),
+                    'type': row.get('type') or 'WSR-88D',
+                })
+        return cls(stations)
+
+    def distance_to(self, station_id: str, latitude: float, longitude: float) -> Optional[float]:
+        """Distance in km from a location to a station, or None if it is not in the table."""
+        for station in self.stations:
+            if station['station_id'] == station_id:
+                return round(haversine_km(latitude, longitude, station['latitude'], station['longitude']), 1)
+        return None
+
+    def _build(self, points, depth) -> Optional[_Node]:
+        if not points:
+            return None
+        axis = depth % 3
+        points.sort(key=lambda p: p[0][axis])
+        mid = len(points) // 2
+        point, index = points[mid]
+        return _Node(point, index, axis,
+                     self._build(points[:mid], depth + 1),
+                     self._build(points[mid + 1:], depth + 1))
+
+    def nearest(self, latitude: float, longitude: float, k: int = 1) -> List[Dict]:
+        """
+        find the k closest stations to a location.
+
+        Args:
+            latitude
+            longitude
+            k: number of stations to return
+
+        Returns:
+            List of station dictionaries, closest first, each with distance_km
+        """
+        if k <= 0:
+            return []
+        target = _to_xyz(latitude, longitude)
+        # Max-heap of (-squared chord distance, index) holding the best k so far
+        best = []
+
+        def search(node):
+            if node is None:
+                return
+            dist = sum((a - b) ** 2 for a, b in zip(node.point, target))
+            if len(best) < k:
+                heapq.heappush(best, (-dist, node.index))
+            elif dist < -best[0][0]:
+                heapq.heapreplace(best, (-dist, node.index))
+
+            diff = target[node.axis] - node.point[node.axis]
+            near, far = (node.left, node.right) if diff < 0 else (node.right, node.left)
+            search(near)
+            # Only cross the splitting plane if it is closer than the worst kept match
+            if len(best) < k or diff * diff < -best[0][0]:
+                search(far)
+
+        search(self._root)
+
+        results = []
+        for _, index in sorted(best, key=lambda item: -item[0]):
+            station = dict(self.stations[index])
+            station['distance_km'] = round(haversine_km(latitude, longitude,
+                                                        station['latitude'], station['longitude']), 1)
+            results.append(station)
+        return results
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_station_index() -> RadarStationIndex:
+    """Return the shared station index, building it on first use."""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = RadarStationIndex.from_csv()
+    return _index
+
+
+def _override_key(latitude: float, longitude: float) -> str:
+    # Two decimals (~1 km) is far finer than radar coverage changes
+    return f"{round(latitude, 2)},{round(longitude, 2)}"
+
+
+_overrides_cache = {}
+
+
+def load_overrides(path: str) -> Dict[str, str]:
+    """
+    Read station overrides written by reconciliation, keyed by rounded lat/lon.
+
+    The file is only re-read when its modification time changes.
+    """
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return {}
+    cached = _overrides_cache.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            overrides = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    _overrides_cache[path] = (mtime, overrides)
+    return overrides
+
+
+def save_overrides(path: str, overrides: Dict[str, str]):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(overrides, f, indent=2, sort_keys=True)
+
+
+def override_for(overrides: Dict[str, str], latitude: float, longitude: float) -> Optional[str]:
+    return overrides.get(_override_key(latitude, longitude))
+
+
+def set_override(overrides: Dict[str, str], latitude: float, longitude: float, station_id: Optional[str]):
+    """Record (or clear, with None) the NWS-assigned station for a location."""
+    key = _override_key(latitude, longitude)
+    if station_id:
+        overrides[key] = station_id
+    else:
+        overrides.pop(key, None)
@@ -0,0 +1,126 @@
+# Project Gamma
+#
+# File: responses.py
+# Version: 0.1
+# Date: 10/19/26
+#
+# Author: Ian Seymour / ian.seymour@cwu.edu
+#
+# Description:
+# Field projection and content negotiation for the JSON API. Clients pass
+# ?fields=current.temperature,current.icon to receive only those values, and
+# may ask for MessagePack or a compact array instead of a JSON object via the
+# Accept header. Projection runs before encoding so unused data is never
+# serialized.
+
+import json
+from typing import Dict, List, Optional, Sequence
+from flask import Response, request, jsonify
+
+# msgpack is in requirements.txt, clients asking for it get 406 if it is missing
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+MIMETYPE_JSON = 'application/json'
+MIMETYPE_MSGPACK = 'application/msgpack'
+MIMETYPE_COMPACT = 'application/vnd.gamma.compact+json'
+
+# x-msgpack is still what most client libraries send
+MSGPACK_ALIASES = ('application/msgpack', 'application/x-msgpack')
+
+_MISSING = object()
+
+
+class FieldError(ValueError):
+    """Raised when a requested field does not exist in the response."""
+
+
+def parse_fields(value: Optional[str]) -> Optional[List[str]]:
+    """Split a ?fields= value into a list of dotted paths, or None if not given."""
+    if not value:
+        return None
+    fields = [field.strip() for field in value.split(',') if field.strip()]
+    return fields or None
+
+
+def _lookup(data, path: str):
+    """Follow a dotted path into nested dictionaries."""
+    value = data
+    for part in path.split('.'):
+        if not isinstance(value, dict) or part not in value:
+            return _MISSING
+        value = value[part]
+    return value
+
+
+def project(data: Dict, fields: Sequence[str]) -> Dict:
+    """
+    build a new dictionary containing only the requested dotted paths.
+
+    Args:
+        data: full response dictionary
+        fields: dotted paths such as 'current.temperature' or 'high_temp'
+
+    Returns:
+        Nested dictionary with the same shape as data, limited to fields
+
+    Raises:
+        FieldError if a path does not exist
+    """
+    result = {}
+    for field in fields:
+        value = _lookup(data, field)
+        if value is _MISSING:
+            raise FieldError(field)
+        parts = field.split('.')
+        target = result
+        for part in parts[:-1]:
+            target = target.setdefault(part, {})
+        target[parts[-1]] = value
+    return result
+
+
+def negotiate() -> str:
+    """Pick the response encoding from the Accept header, JSON by default."""
+    offered = [MIMETYPE_JSON, MIMETYPE_COMPACT, *MSGPACK_ALIASES]
+    best = request.accept_mimetypes.best_match(offered, default=MIMETYPE_JSON)
+    if best in MSGPACK_ALIASES:
+        return MIMETYPE_MSGPACK
+    return best
+
+
+def encoded_response(data: Dict, fields: Optional[Sequence[str]] = None):
+    """
+    project data to fields and encode it in the format the client accepts.
+
+    The compact format is a bare JSON array of values in field order (all
+    top-level keys if no fields were given), with the order echoed back in the
+    X-Fields header.
+
+    Returns:
+        A Flask response, or a (response, status) tuple on error
+    """
+    try:
+        if fields:
+            data = project(data, fields)
+    except FieldError as e:
+        return jsonify({'error': f"Unknown field '{e}'"}), 400
+
+    mimetype = negotiate()
+
+    if mimetype == MIMETYPE_MSGPACK:
+        if msgpack is None:
+            return jsonify({'error': 'MessagePack is not available'}), 406
+        response = Response(msgpack.packb(data, use_bin_type=True), mimetype=MIMETYPE_MSGPACK)
+    elif mimetype == MIMETYPE_COMPACT:
+        order = list(fields) if fields else list(data.keys())
+        values = [_lookup(data, field) for field in order]
+        response = Response(json.dumps(values, separators=(',', ':')), mimetype=MIMETYPE_COMPACT)
+        response.headers['X-Fields'] = ','.join(order)
+    else:
+        response = jsonify(data)
+
+    response.vary.add('Accept')
+    return response
@@ -1,23 +1,29 @@
 # Project Gamma
 #
 # File: weather_api.py
-# Version: 0.4
-# Date: 12/3/2025
+# Version: 0.5
+# Date: 10/19/2026
 #
 # Author: Ian Seymour / ian.seymour@cwu.edu
 #
 # Description:
 # Wrapper for NOAA API requests and weather radar retrieval.
 
+import os
 import requests
 from flask import current_app
 from typing import Dict, Optional, Tuple
 import logging
+from .profiling import traced
+from .limiter import get_limiter, UpstreamBusy, PRIORITY_INTERACTIVE
+from .radar_stations import get_station_index, load_overrides, override_for
+from .airnow_cache import get_airnow_cache
 
 logger = logging.getLogger(__name__)
 
 # NOAA API endpoints
 NOAA_POINTS_API = "https://api.weather.gov/points/{latitude},{longitude}"
+NOAA_ALERTS_API = "https://api.weather.gov/alerts/active"
 
 # NOAA Radar Image Endpoints
 # These fetch the GIF loop or static image for a specific station
@@ -30,11 +36,19 @@ AIRNOW_API_ENDPOINT = "https://www.airnowapi.org/aq/observation/latLong/current/
 class WeatherAPI:
     """Wrapper class for NOAA/NWS API calls."""
     
-    def __init__(self):
+    def __init__(self, priority: int = PRIORITY_INTERACTIVE):
         """Initialize the WeatherAPI with headers for NOAA."""
         self.user_agent = current_app.config.get('NOAA_USER_AGENT', 'gamma/ianseymourhansel@gmail.com')
         self.headers = {'User-Agent': self.user_agent}
+        # Background jobs pass PRIORITY_BACKGROUND so page views go first
+        self.priority = priority
+
+    def _get(self, upstream: str, url: str, **kwargs):
+        """requests.get through the upstream's concurrency limiter (may raise UpstreamBusy)."""
+        with get_limiter(upstream).slot(self.priority):
+            return requests.get(url, timeout=10, **kwargs)
     
+    @traced('WeatherAPI.get_points')
     def get_points(self, latitude: float, longitude: float) -> Optional[Dict]:
         """
         get grid point data from NOAA.
@@ -48,13 +62,50 @@ class WeatherAPI:
         """
         try:
             url = NOAA_POINTS_API.format(latitude=latitude, longitude=longitude)
-            response = requests.get(url, headers=self.headers, timeout=10)
+            response = self._get('nws', url, headers=self.headers)
             response.raise_for_status()
             return response.json()
         except requests.RequestException as e:
             logger.error(f"Error fetching points data: {e}")
             return None
     
+    def get_forecast_zone(self, latitude: float, longitude: float) -> Optional[str]:
+        """
+        get the NWS forecast zone (e.g. WAZ026) for a location.
+
+        Args:
+            latitude
+            longitude
+
+        Returns:
+            Zone ID or none if request fails
+        """
+        points = self.get_points(latitude, longitude)
+        if not points or 'properties' not in points:
+            return None
+        return zone_id(points['properties'].get('forecastZone'))
+
+    @traced('WeatherAPI.get_active_alerts')
+    def get_active_alerts(self, zones) -> Optional[list]:
+        """
+        get active alerts for several forecast zones in a single request.
+
+        Args:
+            zones: iterable of zone IDs
+
+        Returns:
+            List of alert features or none if request fails
+        """
+        try:
+            response = self._get('nws', NOAA_ALERTS_API, params={'zone': ','.join(zones)},
+                                 headers=self.headers)
+            response.raise_for_status()
+            return response.json().get('features', [])
+        except Exception as e:
+            logger.error(f"Error fetching active alerts: {e}")
+            return None
+
+    @traced('WeatherAPI.get_weather_data')
     def get_weather_data(self, latitude: float, longitude: float) -> Optional[Dict]:
         """
         get current weather conditions.
@@ -77,6 +128,18 @@ class WeatherAPI:
             if elevation_m is not None:
                 elevation_ft = round(elevation_m * 3.28084) # Convert to feet
 
+            # Gridpoint identifies the forecast cell, shared by nearby locations
+            gridpoint = None
+            grid_office = points['properties'].get('gridId')
+            if grid_office:
+                gridpoint = {
+                    'office': grid_office,
+                    'x': points['properties'].get('gridX'),
+                    'y': points['properties'].get('gridY'),
+                }
+
+            forecast_zone = zone_id(points['properties'].get('forecastZone'))
+
             forecast_hourly_url = points['properties'].get('forecastHourly')
             forecast_standard_url = points['properties'].get('forecast')
 
@@ -84,7 +147,7 @@ class WeatherAPI:
                 return None
 
             # Fetch Hourly Data
-            resp_hourly = requests.get(forecast_hourly_url, headers=self.headers, timeout=10)
+            resp_hourly = self._get('nws', forecast_hourly_url, headers=self.headers)
             resp_hourly.raise_for_status()
             hourly_data = resp_hourly.json()
             
@@ -93,18 +156,22 @@ class WeatherAPI:
             
             # Base current object
             current_conditions = hourly_data['properties']['periods'][0]
+            hourly_updated = hourly_data['properties'].get('updateTime')
+            standard_period = None
 
             # Fetch standard forecast
-            resp_standard = requests.get(forecast_standard_url, headers=self.headers, timeout=10)
+            resp_standard = self._get('nws', forecast_standard_url, headers=self.headers)
             resp_standard.raise_for_status()
             standard_data = resp_standard.json()
             
             high_temp = None
             low_temp = None
+            standard_updated = standard_data.get('properties', {}).get('updateTime')
             
             if standard_data.get('properties', {}).get('periods'):
                 periods = standard_data['properties']['periods']
                 todays_forecast = periods[0]
+                standard_period = todays_forecast.get('startTime')
                 
                 # Add the narrative text
                 current_conditions['detailedForecast'] = todays_forecast.get('detailedForecast', 'Forecast unavailable.')
@@ -137,55 +204,92 @@ class WeatherAPI:
                 'latitude': latitude,
                 'longitude': longitude,
                 'elevation': elevation_ft,
+                'gridpoint': gridpoint,
+                'zone': forecast_zone,
+                # Changes whenever NWS issues a new forecast or the current period
+                # rolls over, used as a cache key for rendered panels
+                'version': '|'.join(str(part) for part in (
+                    hourly_updated, current_conditions.get('startTime'),
+                    standard_updated, standard_period)) if hourly_updated else None,
                 'high_temp': high_temp,
                 'low_temp': low_temp,
                 'dewpoint': dewpoint_f,
                 'precip_prob': precip_prob
             }
+        except UpstreamBusy:
+            # Let the view shed load with a 503 instead of showing "no data"
+            raise
         except Exception as e:
             logger.error(f"Error getting weather data: {e}")
             return None
 
-    def get_radar_info(self, latitude: float, longitude: float) -> Optional[Dict]:
+    @traced('WeatherAPI.get_radar_info')
+    def get_radar_info(self, latitude: float, longitude: float, fallbacks: Optional[int] = None) -> Optional[Dict]:
         """
         get the nearest radar station and image URLs for a location.
+
+        The station comes from the bundled NEXRAD table, so no request is made.
+        Stations recorded by `flask weather reconcile-radar` take precedence.
             
         Args:
             latitude
             longitude
+            fallbacks: how many neighbouring stations to include (default RADAR_FALLBACK_COUNT)
                 
         Returns:
-             Dictionary containing station ID and radar image URLs
+             Dictionary containing station ID and radar image URLs, plus the
+             next closest stations under 'fallbacks' in case a site is down
         """
         try:
-            # Reuse the points API to find the nearest radar station
-            points = self.get_points(latitude, longitude)
-            if not points or 'properties' not in points:
-                return None
-                
-            # Extract the station ID
-            station_id = points['properties'].get('radarStation')
-                
-            if not station_id:
+            count = fallbacks if fallbacks is not None else current_app.config.get('RADAR_FALLBACK_COUNT', 2)
+            count = max(0, count)
+            index = get_station_index()
+            stations = index.nearest(latitude, longitude, k=count + 1)
+            if not stations:
                 logger.warning(f"No radar station found for coordinates: {latitude}, {longitude}")
                 return None
-                
-            # Clean the ID just in case
-            station_id = station_id.strip()
-                
-            return {
-                'station_id': station_id,
-                'static_url': NOAA_RADAR_STATIC.format(station=station_id),
-                'loop_url': NOAA_RADAR_LOOP.format(station=station_id),
-            }
+
+            # NWS assigned a different station here, put it first
+            override = override_for(load_overrides(radar_overrides_path()), latitude, longitude)
+            if override and override != stations[0]['station_id']:
+                distance = index.distance_to(override, latitude, longitude)
+                stations = [{'station_id': override, 'distance_km': distance}] + \
+                    [s for s in stations if s['station_id'] != override][:count]
+
+            radar = [{
+                'station_id': station['station_id'],
+                'distance_km': station['distance_km'],
+                'static_url': NOAA_RADAR_STATIC.format(station=station['station_id']),
+                'loop_url': NOAA_RADAR_LOOP.format(station=station['station_id']),
+            } for station in stations]
+
+            primary = radar[0]
+            primary['fallbacks'] = radar[1:]
+            return primary
         except Exception as e:
             logger.error(f"Error getting radar info: {e}")
             return None
+
+    def get_nws_radar_station(self, latitude: float, longitude: float) -> Optional[str]:
+        """
+        get the radar station NWS assigns to a location through /points.
+
+        Only used to reconcile the local station table.
+        """
+        points = self.get_points(latitude, longitude)
+        if not points or 'properties' not in points:
+            return None
+        station_id = points['properties'].get('radarStation')
+        return station_id.strip() if station_id else None
             
+    @traced('WeatherAPI.get_air_quality')
     def get_air_quality(self, latitude: float, longitude: float) -> Optional[Dict]:
         """
         get current air quality data from AirNow.
 
+        Results are cached per reporting area until the next hourly AirNow
+        update, so nearby locations share a single upstream call.
+
         Args:
             latitude
             longitude
@@ -197,7 +301,47 @@ class WeatherAPI:
         if not api_key:
             logger.warning("AirNow API key not found in config.")
             return None
-        
+
+        cache = get_airnow_cache()
+        hit, cached, stale = cache.lookup(latitude, longitude)
+        if hit:
+            return cached
+
+        # Only one request per area goes upstream, the rest wait for its result
+        key = cache.fetch_key(latitude, longitude)
+        running = cache.claim(key)
+        if running is not None:
+            finished = cache.wait(running)
+            hit, cached, _ = cache.lookup(latitude, longitude)
+            if hit:
+                return cached
+            if not finished and stale is None:
+                # Same answer the shed (or still waiting) leader gets
+                raise UpstreamBusy('airnow', cache.retry_after)
+            return stale
+
+        shed = False
+        try:
+            data = self._fetch_air_quality(cache, latitude, longitude, api_key)
+            return data if data is not None else stale
+        except UpstreamBusy:
+            shed = True
+            if stale is not None:
+                return stale
+            raise
+        finally:
+            cache.release(key, shed)
+
+    def _fetch_air_quality(self, cache, latitude: float, longitude: float, api_key: str) -> Optional[Dict]:
+        """
+        Call AirNow for a cache miss and store the result.
+
+        Returns None on failure so the caller can fall back to stale data.
+        """
+        if not cache.reserve_call():
+            logger.warning("AirNow hourly quota used up, serving cached air quality data.")
+            return None
+
         try:
             url = AIRNOW_API_ENDPOINT.format(
                 latitude=latitude, 
@@ -205,22 +349,40 @@ class WeatherAPI:
                 api_key=api_key
             )
             
-            response = requests.get(url, timeout=10)
+            response = self._get('airnow', url)
             response.raise_for_status()
             data = response.json()
             
             # AirNow returns a list of pollutants, this will display the worst one
             if not data:
+                cache.store(latitude, longitude, None)
                 return None
                 
             # Find the primary pollutant with highest AQI
             primary = max(data, key=lambda x: x['AQI'])
+            cache.store(latitude, longitude, primary)
             return primary
-            
+
+        except UpstreamBusy:
+            # The call never reached AirNow, so it does not count against the quota
+            cache.refund_call()
+            raise
         except Exception as e:
             logger.error(f"Error getting air quality data: {e}")
             return None
 
+def radar_overrides_path() -> str:
+    """Location of the station overrides written by reconcile-radar."""
+    return current_app.config.get('RADAR_OVERRIDES_FILE') or \
+        os.path.join(current_app.instance_path, 'radar_overrides.json')
+
+def zone_id(zone_url: Optional[str]) -> Optional[str]:
+    """Extract the zone ID from an NWS zone URL (.../zones/forecast/WAZ026)."""
+    if not zone_url:
+        return None
+    return zone_url.rstrip('/').rsplit('/', 1)[-1]
+
+@traced('geocode_location')
 def geocode_location(location: str) -> Optional[Tuple[float, float, str]]:
     """
     Geocode a location name to latitude and longitude.
@@ -241,12 +403,13 @@ def geocode_location(location: str) -> Optional[Tuple[float, float, str]]:
             'addresstype': 'city'
         }
         
-        response = requests.get(
-            'https://nominatim.openstreetmap.org/search',
-            params=params,
-            headers=headers,
-            timeout=10
-        )
+        with get_limiter('nominatim').slot(PRIORITY_INTERACTIVE):
+            response = requests.get(
+                'https://nominatim.openstreetmap.org/search',
+                params=params,
+                headers=headers,
+                timeout=10
+            )
         response.raise_for_status()
         
         results = response.json()
@@ -260,6 +423,8 @@ def geocode_location(location: str) -> Optional[Tuple[float, float, str]]:
         city_name = result.get('name', result.get('display_name', location))
         
         return (latitude, longitude, city_name)
+    except UpstreamBusy:
+        raise
     except Exception as e:
         logger.error(f"Error geocoding location '{location}': {e}")
         return None
\ No newline at end of file
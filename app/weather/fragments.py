@@ -0,0 +1,91 @@
+# Project Gamma
+#
+# File: fragments.py
+# Version: 0.1
+# Date: 10/19/26
+#
+# Author: Ian Seymour / ian.seymour@cwu.edu
+#
+# Description:
+# In-process cache of rendered dashboard panels. Panels that only depend on
+# upstream data (radar, forecast, AQI) are keyed by gridpoint plus the data
+# version reported by NOAA/AirNow, so every user looking at the same city
+# shares one rendering until the data changes.
+
+import time
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+from flask import current_app, render_template
+from markupsafe import Markup
+
+
+class FragmentCache:
+    """Thread-safe LRU of rendered HTML with a time-to-live per entry."""
+
+    def __init__(self, max_entries: int = 512, ttl: int = 900):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple) -> Optional[Markup]:
+        """Return a cached fragment, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, html = entry
+            if expires < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return html
+
+    def set(self, key: Tuple, html: Markup):
+        """Store a fragment, evicting the least recently used one if full."""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, html)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+def get_fragment_cache() -> FragmentCache:
+    """Return the app's fragment cache, creating it from config on first use."""
+    cache = current_app.extensions.get('fragment_cache')
+    if cache is None:
+        cache = FragmentCache(
+            max_entries=current_app.config.get('FRAGMENT_CACHE_SIZE', 512),
+            ttl=current_app.config.get('FRAGMENT_CACHE_TTL', 900),
+        )
+        current_app.extensions['fragment_cache'] = cache
+    return cache
+
+
+def render_fragment(template: str, key: Optional[Tuple], **context) -> Markup:
+    """
+    render a panel template, reusing a cached copy when the key matches.
+
+    Args:
+        template: template name of the panel
+        key: cache key (gridpoint + data version), or None to skip caching
+        context: variables passed to the template
+
+    Returns:
+        The rendered panel as Markup
+    """
+    if key is None or not current_app.config.get('FRAGMENT_CACHE_ENABLED', True):
+        return Markup(render_template(template, **context))
+
+    cache = get_fragment_cache()
+    full_key = (template,) + tuple(key)
+    html = cache.get(full_key)
+    if html is None:
+        html = Markup(render_template(template, **context))
+        cache.set(full_key, html)
+    return html
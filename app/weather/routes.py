@@ -1,22 +1,103 @@
 # Project Gamma
 #
 # File: routes.py
-# Version: 0.3
-# Date: 12/2/25
+# Version: 0.4
+# Date: 10/19/26
 #
 # Author: Ian Seymour / ian.seymour@cwu.edu
 #
 # Description:
 # Routes for weather-related views in the Project Gamma web application.
 
+import os
+import time
+import click
 from flask import render_template, request, jsonify, flash, redirect, url_for
 from flask_login import login_required, current_user
 from . import weather_bp
 from ..models import Favorite
-from ..utils.weather_api import WeatherAPI, geocode_location
+from ..utils.weather_api import WeatherAPI, geocode_location, radar_overrides_path
+from ..utils.radar_stations import get_station_index, load_overrides, save_overrides, set_override
+from ..utils.observation_store import ObservationStore, make_grid_id, COLUMNS, AGGREGATES, MAX_BUCKETS
+from ..utils.responses import encoded_response, parse_fields
+from ..utils.profiling import span
+from ..utils.alerts import get_alert_monitor
+from ..utils.airnow_cache import get_airnow_cache
+from ..utils.limiter import UpstreamBusy, PRIORITY_BACKGROUND
+from .fragments import render_fragment
 from .. import db
 
 
+@weather_bp.errorhandler(UpstreamBusy)
+def upstream_busy(error):
+    """Shed load quickly when an upstream has no free slot."""
+    # The API and the lazily loaded panels expect JSON
+    if request.path.startswith(('/api/', '/radar/', '/aqi/')):
+        response = jsonify({'error': f"Waiting on {error.service_name}, please retry shortly.",
+                            'upstream': error.upstream})
+    else:
+        response = render_template('weather/busy.html', retry_after=error.retry_after,
+                                   service_name=error.service_name)
+    return response, 503, {'Retry-After': str(error.retry_after)}
+
+
+def location_alerts(weather_api, latitude, longitude, weather_data):
+    """
+    Look up active alerts for a location from the shared alert monitor.
+
+    Returns None if the zone's alerts could not be checked yet.
+    """
+    if not weather_data or not weather_data.get('zone'):
+        return []
+    monitor = get_alert_monitor()
+    monitor.remember_zone(latitude, longitude, weather_data['zone'])
+    return monitor.alerts_for(weather_data['zone'], weather_api)
+
+
+def record_observation(weather_data, aqi_data=None):
+    """Append the current conditions to the observation store for their gridpoint."""
+    if not weather_data or not weather_data.get('gridpoint'):
+        return False
+    gridpoint = weather_data['gridpoint']
+    grid_id = make_grid_id(gridpoint['office'], gridpoint['x'], gridpoint['y'])
+    return ObservationStore().append(
+        grid_id,
+        temperature=weather_data['current'].get('temperature'),
+        dewpoint=weather_data.get('dewpoint'),
+        precip_prob=weather_data.get('precip_prob'),
+        aqi=aqi_data.get('AQI') if aqi_data else None,
+    )
+
+
+def render_dashboard(favorites, current_location, weather_data=None, alerts=()):
+    """
+    Render the dashboard, reusing the cached forecast panel.
+
+    The forecast panel only depends on upstream data, so it is keyed by
+    gridpoint plus the data version. The sidebar and flashed messages are
+    still rendered for every request. Radar and air quality are not fetched
+    here, the page loads them from /radar and /aqi once they scroll into view.
+    alerts is None when they could not be checked.
+    """
+    forecast_panel = None
+    if weather_data and weather_data.get('current'):
+        key = None
+        gridpoint = weather_data.get('gridpoint')
+        if gridpoint and weather_data.get('version'):
+            key = (make_grid_id(gridpoint['office'], gridpoint['x'], gridpoint['y']),
+                   weather_data['version'])
+        forecast_panel = render_fragment('weather/_forecast_panel.html', key,
+                                         weather_data=weather_data)
+
+    with span('render weather/dashboard.html'):
+        return render_template('weather/dashboard.html',
+                               favorites=favorites,
+                               weather_data=weather_data,
+                               current_location=current_location,
+                               forecast_panel=forecast_panel,
+                               alerts=alerts)
+
+
 @weather_bp.route('/')
 @login_required
 def dashboard():
@@ -24,8 +105,7 @@ def dashboard():
     favorites = Favorite.query.filter_by(user_id=current_user.id).all()
     weather_data = None
     current_location = None
-    radar_data = None
-    aqi_data = None
+    alerts = []
     lat = None
     lon = None
     
@@ -50,18 +130,19 @@ def dashboard():
         }
 
     # Fetch data using the determined coordinates
-    if lat and lon:
+    if lat is not None and lon is not None:
         weather_api = WeatherAPI()
         weather_data = weather_api.get_weather_data(lat, lon)
-        radar_data = weather_api.get_radar_info(lat, lon)
-        aqi_data = weather_api.get_air_quality(lat, lon)
+
+        # Keep a trend history for saved locations only. AQI is loaded after
+        # the page, so only an already cached value is recorded (no AirNow call).
+        if isinstance(current_location, Favorite):
+            hit, aqi_data, _ = get_airnow_cache().lookup(lat, lon)
+            record_observation(weather_data, aqi_data if hit else None)
+
+        alerts = location_alerts(weather_api, lat, lon, weather_data)
     
-    return render_template('weather/dashboard.html', 
-                          favorites=favorites,
-                          weather_data=weather_data,
-                          current_location=current_location,
-                          radar_data=radar_data,
-                          aqi_data=aqi_data)
+    return render_dashboard(favorites, current_location, weather_data, alerts)
 
 
 @weather_bp.route('/search', methods=['POST'])
@@ -90,7 +171,7 @@ def search_location():
         flash('Unable to fetch weather data. Please try again.', 'danger')
         return redirect(url_for('weather.dashboard'))
     
-    radar_data = weather_api.get_radar_info(latitude, longitude)
+    alerts = location_alerts(weather_api, latitude, longitude, weather_data)
     
     favorites = Favorite.query.filter_by(user_id=current_user.id).all()
     
@@ -102,25 +183,87 @@ def search_location():
         'id': None
     }
     
-    return render_template('weather/dashboard.html',
-                         favorites=favorites,
-                         weather_data=weather_data,
-                         current_location=current_location,
-                         radar_data=radar_data)
+    return render_dashboard(favorites, current_location, weather_data, alerts)
 
 
-@weather_bp.route('/api/weather/<float:latitude>/<float:longitude>')
+@weather_bp.route('/api/weather/<float(signed=True):latitude>/<float(signed=True):longitude>')
 @login_required
 def api_weather(latitude, longitude):
-    """API endpoint to fetch weather data."""
+    """
+    API endpoint to fetch weather data.
+
+    ?fields= limits the response to comma separated dotted paths (for example
+    current.temperature,current.icon), and the Accept header selects JSON,
+    MessagePack or a compact JSON array.
+    """
     weather_api = WeatherAPI()
     weather_data = weather_api.get_weather_data(latitude, longitude)
     
     if not weather_data:
         return jsonify({'error': 'Unable to fetch weather data'}), 400
     
-    # Simplify the response for JSON
-    return jsonify(weather_data)
+    # Project before encoding so unused fields are never serialized
+    return encoded_response(weather_data, parse_fields(request.args.get('fields')))
+
+
+@weather_bp.route('/api/alerts/<float(signed=True):latitude>/<float(signed=True):longitude>')
+@login_required
+def api_alerts(latitude, longitude):
+    """API endpoint for active alerts at a location, served from the shared monitor."""
+    weather_api = WeatherAPI()
+    monitor = get_alert_monitor()
+    zone = monitor.zone_for(latitude, longitude, weather_api)
+    if not zone:
+        return jsonify({'error': 'Unable to determine forecast zone'}), 400
+
+    alerts = monitor.alerts_for(zone, weather_api)
+    return jsonify({
+        'zone': zone,
+        'alerts': alerts or [],
+        'checked': alerts is not None,
+        'updated': int(monitor.last_poll),
+    })
+
+
+@weather_bp.route('/api/trends/<office>/<int:grid_x>/<int:grid_y>')
+@login_required
+def api_trends(office, grid_x, grid_y):
+    """API endpoint for stored observation trends at a gridpoint."""
+    hours = request.args.get('hours', 24, type=int)
+    bucket = request.args.get('bucket', type=int)
+    func = request.args.get('agg', 'mean')
+
+    if hours <= 0 or hours > 24 * 365:
+        return jsonify({'error': 'hours must be between 1 and 8760'}), 400
+    if bucket is not None and bucket <= 0:
+        return jsonify({'error': 'bucket must be a positive number of seconds'}), 400
+    if bucket and hours * 3600 / bucket > MAX_BUCKETS:
+        return jsonify({'error': f"bucket is too small, at most {MAX_BUCKETS} buckets per query"}), 400
+    if func not in AGGREGATES:
+        return jsonify({'error': f"agg must be one of {', '.join(AGGREGATES)}"}), 400
+
+    grid_id = make_grid_id(office.upper(), grid_x, grid_y)
+    end = int(time.time())
+    start = end - hours * 3600
+    store = ObservationStore()
+
+    response = {
+        'gridpoint': grid_id,
+        'start': start,
+        'end': end,
+        'summary': store.summary(grid_id, start, end),
+    }
+
+    if bucket:
+        response['series'] = store.aggregate(grid_id, start, end, bucket, func)
+    else:
+        # Raw samples are returned column-wise, NaN becomes null
+        data = store.read(grid_id, start, end)
+        response['series'] = {'timestamp': data['timestamp'].tolist()}
+        for column in COLUMNS:
+            response['series'][column] = [v if v == v else None for v in data[column]]
+
+    return jsonify(response)
 
 
 @weather_bp.route('/favorites/add', methods=['POST'])
@@ -174,12 +317,79 @@ def remove_favorite(favorite_id):
     return redirect(url_for('weather.dashboard'))
 
 
-@weather_bp.route('/radar/<float:latitude>/<float:longitude>')
+@weather_bp.route('/radar/<float(signed=True):latitude>/<float(signed=True):longitude>')
 @login_required
 def get_radar(latitude, longitude):
-    """Get weather radar info for a specific location."""
+    """Get weather radar info for a specific location (?fallbacks=N for more neighbours)."""
+    fallbacks = request.args.get('fallbacks', type=int)
+    if fallbacks is not None:
+        fallbacks = max(0, min(fallbacks, 10))
     weather_api = WeatherAPI()
-    radar_info = weather_api.get_radar_info(latitude, longitude)
+    radar_info = weather_api.get_radar_info(latitude, longitude, fallbacks)
     if not radar_info:
         return jsonify({'error': 'Radar not found'}), 404
     return jsonify(radar_info)
+
+
+@weather_bp.route('/aqi/<float(signed=True):latitude>/<float(signed=True):longitude>')
+@login_required
+def get_aqi(latitude, longitude):
+    """Get the current air quality for a specific location."""
+    weather_api = WeatherAPI()
+    aqi_data = weather_api.get_air_quality(latitude, longitude)
+    if not aqi_data:
+        return jsonify({'error': 'Air quality not found'}), 404
+    return jsonify({
+        'AQI': aqi_data.get('AQI'),
+        'category': aqi_data.get('Category', {}).get('Name'),
+        'parameter': aqi_data.get('ParameterName'),
+        'area': aqi_data.get('ReportingArea'),
+    })
+
+
+@weather_bp.cli.command('collect-observations')
+def collect_observations():
+    """Store a sample for every favorite location's gridpoint."""
+    weather_api = WeatherAPI(priority=PRIORITY_BACKGROUND)
+    locations = {(f.latitude, f.longitude) for f in Favorite.query.all()}
+    stored = 0
+    for lat, lon in locations:
+        weather_data = weather_api.get_weather_data(lat, lon)
+        if not weather_data:
+            continue
+        aqi_data = weather_api.get_air_quality(lat, lon)
+        if record_observation(weather_data, aqi_data):
+            stored += 1
+    click.echo(f"Stored {stored} observations for {len(locations)} favorite locations.")
+
+
+@weather_bp.cli.command('compact-observations')
+def compact_observations():
+    """Downsample or drop observation chunks past their retention."""
+    changed = ObservationStore().compact()
+    click.echo(f"Compacted {changed} observation chunks.")
+
+
+@weather_bp.cli.command('reconcile-radar')
+def reconcile_radar():
+    """Compare the local radar station table with NWS for every favorite."""
+    weather_api = WeatherAPI(priority=PRIORITY_BACKGROUND)
+    path = radar_overrides_path()
+    overrides = dict(load_overrides(path))
+    index = get_station_index()
+    checked = mismatched = 0
+    for lat, lon in {(f.latitude, f.longitude) for f in Favorite.query.all()}:
+        nws_station = weather_api.get_nws_radar_station(lat, lon)
+        if not nws_station:
+            continue
+        checked += 1
+        local_station = index.nearest(lat, lon)[0]['station_id']
+        if nws_station != local_station:
+            mismatched += 1
+            click.echo(f"{lat}, {lon}: NWS uses {nws_station}, nearest is {local_station}")
+            set_override(overrides, lat, lon, nws_station)
+        else:
+            set_override(overrides, lat, lon, None)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    save_overrides(path, overrides)
+    click.echo(f"Checked {checked} locations, {mismatched} overridden.")
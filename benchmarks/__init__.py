@@ -0,0 +1 @@
+# Project Gamma micro-benchmarks, see benchmarks/run.py.
@@ -0,0 +1,234 @@
+# Project Gamma
+#
+# File: payloads.py
+# Version: 0.1
+# Date: 10/19/26
+#
+# Author: Ian Seymour / ian.seymour@cwu.edu
+#
+# Description:
+# Payload corpus for the micro-benchmarks. Responses recorded with
+# benchmarks/record.py are read from benchmarks/payloads/. Anything that has
+# not been recorded is generated with the same structure NWS, AirNow and
+# Nominatim return, so the suite also runs offline. Hourly forecasts come in
+# three sizes: small (1 period), typical (48) and worst case (156, the most
+# NWS returns).
+
+import os
+import json
+from datetime import datetime, timedelta, timezone
+
+PAYLOAD_DIR = os.path.join(os.path.dirname(__file__), 'payloads')
+
+HOURLY_SIZES = {
+    'small': 1,
+    'typical': 48,
+    'worst': 156,
+}
+
+LATITUDE = 46.9965
+LONGITUDE = -120.5478
+OFFICE, GRID_X, GRID_Y = 'PDT', 43, 99
+BASE_URL = f"https://api.weather.gov/gridpoints/{OFFICE}/{GRID_X},{GRID_Y}"
+START = datetime(2026, 1, 15, 6, tzinfo=timezone(timedelta(hours=-8)))
+
+
+def _polygon():
+    return {
+        'type': 'Polygon',
+        'coordinates': [[
+            [-120.5602, 46.9845], [-120.5651, 47.0062], [-120.5332, 47.0096],
+            [-120.5284, 46.9879], [-120.5602, 46.9845],
+        ]],
+    }
+
+
+def make_points():
+    return {
+        '@context': ['https://geojson.org/geojson-ld/geojson-context.jsonld', {'@version': '1.1'}],
+        'id': f"https://api.weather.gov/points/{LATITUDE},{LONGITUDE}",
+        'type': 'Feature',
+        'geometry': {'type': 'Point', 'coordinates': [LONGITUDE, LATITUDE]},
+        'properties': {
+            '@id': f"https://api.weather.gov/points/{LATITUDE},{LONGITUDE}",
+            '@type': 'wx:Point',
+            'cwa': OFFICE,
+            'forecastOffice': f"https://api.weather.gov/offices/{OFFICE}",
+            'gridId': OFFICE,
+            'gridX': GRID_X,
+            'gridY': GRID_Y,
+            'forecast': f"{BASE_URL}/forecast",
+            'forecastHourly': f"{BASE_URL}/forecast/hourly",
+            'forecastGridData': BASE_URL,
+            'observationStations': f"{BASE_URL}/stations",
+            'relativeLocation': {
+                'type': 'Feature',
+                'geometry': {'type': 'Point', 'coordinates': [-120.547847, 46.996514]},
+                'properties': {
+                    'city': 'Ellensburg',
+                    'state': 'WA',
+                    'distance': {'unitCode': 'wmoUnit:m', 'value': 45.6},
+                    'bearing': {'unitCode': 'wmoUnit:degree_(angle)', 'value': 180},
+                },
+            },
+            'forecastZone': 'https://api.weather.gov/zones/forecast/WAZ026',
+            'county': 'https://api.weather.gov/zones/county/WAC037',
+            'fireWeatherZone': 'https://api.weather.gov/zones/fire/WAZ675',
+            'timeZone': 'America/Los_Angeles',
+            'radarStation': 'KPDT',
+            'elevation': {'unitCode': 'wmoUnit:m', 'value': 466.9536},
+        },
+    }
+
+
+def _forecast_envelope(periods, hourly):
+    generated = START.isoformat()
+    return {
+        '@context': ['https://geojson.org/geojson-ld/geojson-context.jsonld', {'@version': '1.1'}],
+        'type': 'Feature',
+        'geometry': _polygon(),
+        'properties': {
+            'units': 'us',
+            'forecastGenerator': 'HourlyForecastGenerator' if hourly else 'BaselineForecastGenerator',
+            'generatedAt': generated,
+            'updateTime': generated,
+            'validTimes': f"{generated}/P7DT18H",
+            'elevation': {'unitCode': 'wmoUnit:m', 'value': 466.9536},
+            'periods': periods,
+        },
+    }
+
+
+def make_hourly(count):
+    periods = []
+    for i in range(count):
+        start = START + timedelta(hours=i)
+        daytime = 7 <= start.hour < 17
+        temperature = 28 + (i * 7) % 19
+        periods.append({
+            'number': i + 1,
+            'name': '',
+            'startTime': start.isoformat(),
+            'endTime': (start + timedelta(hours=1)).isoformat(),
+            'isDaytime': daytime,
+            'temperature': temperature,
+            'temperatureUnit': 'F',
+            'temperatureTrend': '',
+            'probabilityOfPrecipitation': {'unitCode': 'wmoUnit:percent', 'value': (i * 3) % 40},
+            'dewpoint': {'unitCode': 'wmoUnit:degC', 'value': -6.111111111111111 + (i % 5) * 0.5555555555555556},
+            'relativeHumidity': {'unitCode': 'wmoUnit:percent', 'value': 60 + i % 30},
+            'windSpeed': f"{5 + i % 10} mph",
+            'windDirection': ('NW', 'W', 'SW', 'N')[i % 4],
+            'icon': f"https://api.weather.gov/icons/land/{'day' if daytime else 'night'}/sct,{(i * 3) % 40}?size=small",
+            'shortForecast': ('Mostly Clear', 'Partly Cloudy', 'Chance Light Snow')[i % 3],
+            'detailedForecast': '',
+        })
+    return _forecast_envelope(periods, hourly=True)
+
+
+def make_forecast(count=14):
+    periods = []
+    for i in range(count):
+        start = START + timedelta(hours=12 * i)
+        daytime = i % 2 == 0
+        periods.append({
+            'number': i + 1,
+            'name': ('Today', 'Tonight', 'Friday', 'Friday Night', 'Saturday', 'Saturday Night', 'Sunday')[i % 7],
+            'startTime': start.isoformat(),
+            'endTime': (start + timedelta(hours=12)).isoformat(),
+            'isDaytime': daytime,
+            'temperature': 38 - (0 if daytime else 14) + i % 4,
+            'temperatureUnit': 'F',
+            'temperatureTrend': '',
+            'probabilityOfPrecipitation': {'unitCode': 'wmoUnit:percent', 'value': 20},
+            'windSpeed': '5 to 10 mph',
+            'windDirection': 'NW',
+            'icon': f"https://api.weather.gov/icons/land/{'day' if daytime else 'night'}/sct/sn,20?size=medium",
+            'shortForecast': 'Partly Sunny then Slight Chance Light Snow',
+            'detailedForecast': ('A slight chance of light snow after 4pm. Partly sunny, with a high near 38. '
+                                 'Northwest wind 5 to 10 mph. Chance of precipitation is 20%. '
+                                 'New snow accumulation of less than half an inch possible.'),
+        })
+    return _forecast_envelope(periods, hourly=False)
+
+
+def make_airnow(count=3):
+    pollutants = ('O3', 'PM2.5', 'PM10', 'CO', 'NO2', 'SO2')
+    return [{
+        'DateObserved': '2026-01-15 ',
+        'HourObserved': 6,
+        'LocalTimeZone': 'PST',
+        'ReportingArea': 'Yakima',
+        'StateCode': 'WA',
+        'Latitude': 46.6,
+        'Longitude': -120.51,
+        'ParameterName': pollutants[i % len(pollutants)],
+        'AQI': 20 + (i * 17) % 60,
+        'Category': {'Number': 1, 'Name': 'Good'},
+    } for i in range(count)]
+
+
+def make_nominatim():
+    return [{
+        'place_id': 298401234,
+        'licence': 'Data (c) OpenStreetMap contributors, ODbL 1.0. http://osm.org/copyright',
+        'osm_type': 'relation',
+        'osm_id': 237547,
+        'lat': '46.9965144',
+        'lon': '-120.5478474',
+        'class': 'boundary',
+        'type': 'administrative',
+        'place_rank': 16,
+        'importance': 0.5135,
+        'addresstype': 'city',
+        'name': 'Ellensburg',
+        'display_name': 'Ellensburg, Kittitas County, Washington, United States',
+        'boundingbox': ['46.9638318', '47.0218936', '-120.5890463', '-120.4940919'],
+    }]
+
+
+def _recorded(name):
+    path = os.path.join(PAYLOAD_DIR, f"{name}.json")
+    if os.path.isfile(path):
+        with open(path, 'rb') as f:
+            return json.load(f)
+    return None
+
+
+def load_corpus():
+    """
+    build the benchmark corpus as raw JSON bytes, preferring recorded payloads.
+
+    Returns:
+        Tuple of (corpus dict, set of names that came from recordings)
+    """
+    recorded = set()
+
+    def pick(name, generate):
+        data = _recorded(name)
+        if data is None:
+            data = generate()
+        else:
+            recorded.add(name)
+        return data
+
+    points = pick('points', make_points)
+    forecast = pick('forecast', make_forecast)
+    hourly = pick('hourly', lambda: make_hourly(max(HOURLY_SIZES.values())))
+    airnow = pick('airnow', lambda: make_airnow(6))
+    nominatim = pick('nominatim', make_nominatim)
+
+    corpus = {
+        'points': points,
+        'forecast': forecast,
+        'nominatim': nominatim,
+        'airnow_typical': airnow[:3],
+        'airnow_worst': airnow,
+    }
+    # One recorded hourly forecast provides every size
+    for size, count in HOURLY_SIZES.items():
+        sized = json.loads(json.dumps(hourly))
+        sized['properties']['periods'] = sized['properties']['periods'][:count]
+        corpus[f"hourly_{size}"] = sized
+
+    return {name: json.dumps(data).encode('utf-8') for name, data in corpus.items()}, recorded
@@ -0,0 +1,69 @@
+# Project Gamma
+#
+# File: record.py
+# Version: 0.1
+# Date: 10/19/26
+#
+# Author: Ian Seymour / ian.seymour@cwu.edu
+#
+# Description:
+# Records real upstream responses into benchmarks/payloads/ for the
+# micro-benchmarks. Run from the repository root:
+#
+#   python benchmarks/record.py --lat 46.9965 --lon -120.5478 --place Ellensburg
+#
+# AirNow is only recorded when AIRNOW_API_KEY is set.
+
+import os
+import sys
+import json
+import argparse
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils.weather_api import NOAA_POINTS_API, AIRNOW_API_ENDPOINT
+from benchmarks.payloads import PAYLOAD_DIR
+
+
+def fetch(url, **kwargs):
+    response = requests.get(url, timeout=30, **kwargs)
+    response.raise_for_status()
+    return response.json()
+
+
+def save(name, data):
+    path = os.path.join(PAYLOAD_DIR, f"{name}.json")
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+    print(f"Recorded {name} ({os.path.getsize(path)} bytes)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Record upstream payloads for the benchmarks.')
+    parser.add_argument('--lat', type=float, default=46.9965)
+    parser.add_argument('--lon', type=float, default=-120.5478)
+    parser.add_argument('--place', default='Ellensburg')
+    args = parser.parse_args()
+
+    os.makedirs(PAYLOAD_DIR, exist_ok=True)
+    headers = {'User-Agent': os.environ.get('NOAA_USER_AGENT', 'gamma/ianseymourhansel@gmail.com')}
+
+    points = fetch(NOAA_POINTS_API.format(latitude=args.lat, longitude=args.lon), headers=headers)
+    save('points', points)
+    save('forecast', fetch(points['properties']['forecast'], headers=headers))
+    save('hourly', fetch(points['properties']['forecastHourly'], headers=headers))
+
+    save('nominatim', fetch('https://nominatim.openstreetmap.org/search',
+                            params={'q': args.place, 'format': 'json', 'limit': 1, 'addresstype': 'city'},
+                            headers={'User-Agent': 'gamma-weather-app'}))
+
+    api_key = os.environ.get('AIRNOW_API_KEY')
+    if api_key:
+        save('airnow', fetch(AIRNOW_API_ENDPOINT.format(latitude=args.lat, longitude=args.lon, api_key=api_key)))
+    else:
+        print("AIRNOW_API_KEY not set, skipping AirNow")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,272 @@
+# Project Gamma
+#
+# File: run.py
+# Version: 0.1
+# Date: 10/19/26
+#
+# Author: Ian Seymour / ian.seymour@cwu.edu
+#
+# Description:
+# CPU micro-benchmarks for our own parsing and rendering code, run against
+# the payload corpus in benchmarks/payloads.py with every upstream call
+# answered locally. Reports ops/sec and the peak memory allocated during one
+# call (tracemalloc), and compares them to a stored baseline. Baselines are
+# machine specific, so record one locally before making a change. Run from
+# the repository root:
+#
+#   python benchmarks/run.py --save-baseline  # record a baseline
+#   python benchmarks/run.py                  # run and compare to the baseline
+#   python benchmarks/run.py -k weather_data  # only matching benchmarks
+#
+# The exit code is 1 when any benchmark regresses by more than --threshold,
+# and 2 when there is no baseline to compare against.
+
+import os
+import sys
+import json
+import time
+import argparse
+import tracemalloc
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests
+from flask_login import login_user
+from wtforms.validators import ValidationError
+from app import create_app
+from app.models import User, Favorite
+from app.auth.forms import ComplexityValidator
+from app.utils.weather_api import WeatherAPI, geocode_location
+from app.weather.routes import render_dashboard
+from config import TestingConfig
+from benchmarks.payloads import load_corpus, HOURLY_SIZES, LATITUDE, LONGITUDE
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+# Minimum time per timing run, the iteration count is doubled until reached
+MIN_RUN_TIME = 0.2
+REPEATS = 5
+
+PASSWORDS = ('abc123', 'Password1', 'alllowercaseletters', 'Tr0ub4dor&3xyzABCD!')
+
+
+class BenchmarkConfig(TestingConfig):
+    AIRNOW_API_KEY = 'benchmark'
+    FRAGMENT_CACHE_ENABLED = False
+    PROFILING_ENABLED = False
+    WTF_CSRF_ENABLED = False
+
+
+class _Field:
+    """Just enough of a WTForms field for validators."""
+
+    def __init__(self, data):
+        self.data = data
+
+
+def _response(body: bytes) -> requests.Response:
+    response = requests.Response()
+    response.status_code = 200
+    response._content = body
+    response.encoding = 'utf-8'
+    return response
+
+
+def make_upstream(corpus, hourly='typical', airnow='typical'):
+    """Build a requests.get replacement that answers from the corpus."""
+    responses = {
+        'points': _response(corpus['points']),
+        'forecast': _response(corpus['forecast']),
+        'hourly': _response(corpus[f"hourly_{hourly}"]),
+        'airnow': _response(corpus[f"airnow_{airnow}"]),
+        'nominatim': _response(corpus['nominatim']),
+    }
+
+    def fake_get(url, *args, **kwargs):
+        if '/points/' in url:
+            return responses['points']
+        if url.endswith('/forecast/hourly'):
+            return responses['hourly']
+        if url.endswith('/forecast'):
+            return responses['forecast']
+        if 'airnowapi' in url:
+            return responses['airnow']
+        if 'nominatim' in url:
+            return responses['nominatim']
+        raise AssertionError(f"Unexpected upstream URL in benchmark: {url}")
+
+    return fake_get
+
+
+def build_benchmarks(app, corpus):
+    """
+    create the benchmark callables.
+
+    Returns:
+        List of (name, upstream, func) where upstream is the requests.get
+        replacement active while func runs
+    """
+    benchmarks = []
+
+    with app.app_context():
+        api = WeatherAPI()
+
+    for size in HOURLY_SIZES:
+        def weather_data(api=api):
+            return api.get_weather_data(LATITUDE, LONGITUDE)
+        benchmarks.append((f"weather_data[{size}]", make_upstream(corpus, hourly=size), weather_data))
+
+    for size in ('typical', 'worst'):
+        def air_quality(api=api):
+            # Drop the cache so every call parses the response and picks the max
+            app.extensions.pop('airnow_cache', None)
+            return api.get_air_quality(LATITUDE, LONGITUDE)
+        benchmarks.append((f"air_quality[{size}]", make_upstream(corpus, airnow=size), air_quality))
+
+    def geocode():
+        return geocode_location('Ellensburg')
+    benchmarks.append(('geocode_location', make_upstream(corpus), geocode))
+
+    validator = ComplexityValidator()
+    fields = [_Field(password) for password in PASSWORDS]
+
+    def complexity_validator():
+        for field in fields:
+            try:
+                validator(None, field)
+            except ValidationError:
+                pass
+    benchmarks.append(('complexity_validator', make_upstream(corpus), complexity_validator))
+
+    upstream = make_upstream(corpus)
+    with app.app_context(), mock.patch.object(requests, 'get', upstream):
+        weather = WeatherAPI().get_weather_data(LATITUDE, LONGITUDE)
+    favorites = [Favorite(id=i, city=f"City {i}", latitude=LATITUDE, longitude=LONGITUDE) for i in range(1, 11)]
+    location = {'city': 'Ellensburg', 'latitude': LATITUDE, 'longitude': LONGITUDE, 'id': None}
+
+    def dashboard_render():
+        return render_dashboard(favorites, location, weather, alerts=[])
+    benchmarks.append(('dashboard_render', upstream, dashboard_render))
+
+    return benchmarks
+
+
+def measure(func):
+    """
+    time a callable and measure its memory use.
+
+    tracemalloc cannot count individual allocations, so memory is reported
+    as the peak of live allocations during one call, above what was live
+    before it.
+
+    Returns:
+        Dictionary with ops_per_sec and peak_alloc_kib
+    """
+    func()  # warm up caches, template compilation and imports
+
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= MIN_RUN_TIME:
+            break
+        number *= 2
+
+    best = elapsed
+    for _ in range(REPEATS - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'ops_per_sec': round(number / best, 1),
+        'peak_alloc_kib': round((peak - before) / 1024, 1),
+    }
+
+
+def compare(results, baseline, threshold):
+    """Return the names of benchmarks slower (or hungrier) than baseline by more than threshold."""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        if result['ops_per_sec'] < base['ops_per_sec'] * (1 - threshold):
+            regressions.append(name)
+        elif result['peak_alloc_kib'] > base['peak_alloc_kib'] * (1 + threshold) + 1:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the Project Gamma micro-benchmarks.')
+    parser.add_argument('-k', dest='filter', help='only run benchmarks whose name contains this')
+    parser.add_argument('--baseline', default=BASELINE_FILE, help='baseline JSON file')
+    parser.add_argument('--save-baseline', action='store_true', help='store these results as the baseline')
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help='allowed slowdown before flagging a regression (default 0.10)')
+    args = parser.parse_args()
+
+    corpus, recorded = load_corpus()
+    app = create_app(BenchmarkConfig)
+    benchmarks = build_benchmarks(app, corpus)
+
+    baseline = {}
+    if os.path.isfile(args.baseline):
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    print(f"Payloads: {', '.join(sorted(recorded)) + ' recorded' if recorded else 'generated'}")
+    print(f"{'benchmark':<26}{'ops/sec':>12}{'peak alloc KiB':>16}{'vs baseline':>14}")
+
+    results = {}
+    for name, upstream, func in benchmarks:
+        if args.filter and args.filter not in name:
+            continue
+        with app.test_request_context('/'), mock.patch.object(requests, 'get', upstream):
+            login_user(User(id=1, email='bench@example.com'))
+            result = measure(func)
+        results[name] = result
+
+        change = ''
+        if name in baseline:
+            change = f"{(result['ops_per_sec'] / baseline[name]['ops_per_sec'] - 1) * 100:+.1f}%"
+        print(f"{name:<26}{result['ops_per_sec']:>12,.1f}{result['peak_alloc_kib']:>16}{change:>14}")
+
+    if args.save_baseline:
+        baseline.update(results)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    if not baseline:
+        print(f"No baseline at {args.baseline}, nothing was compared. "
+              f"Run with --save-baseline first.", file=sys.stderr)
+        return 2
+    missing = sorted(set(results) - set(baseline))
+    if missing:
+        print(f"Not in the baseline, not compared: {', '.join(missing)}", file=sys.stderr)
+
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"Regressions beyond {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
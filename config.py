@@ -1,8 +1,8 @@
 # Project Gamma
 #
 # File: config.py
-# Version: 0.2
-# Date: 12/2/25
+# Version: 0.3
+# Date: 10/19/26
 #
 # Author: Ian Seymour / ian.seymour@cwu.edu
 #
@@ -23,10 +23,75 @@ class Config:
 
     # AirNow API Key
     AIRNOW_API_KEY = os.environ.get('AIRNOW_API_KEY')
+
+    # AirNow cache. Observations are kept per reporting area until the next
+    # hourly update, nearby coordinates reuse a known reporting area.
+    AIRNOW_GRID_DEGREES = 0.1      # coordinate snapping (~11 km)
+    AIRNOW_AREA_RADIUS_KM = 25.0   # reuse a reporting area this close
+    AIRNOW_UPDATE_OFFSET = 1200    # seconds past the hour new data is available
+    AIRNOW_HOURLY_QUOTA = int(os.environ.get('AIRNOW_HOURLY_QUOTA', 500))
+    AIRNOW_QUOTA_WARNING = 0.8     # log a warning at this fraction of the quota
+    AIRNOW_WAIT_TIMEOUT = None     # seconds to wait on another request's fetch, defaults to UPSTREAM_QUEUE_TIMEOUT
+    AIRNOW_MAX_WAITERS = 16        # requests allowed to wait on fetches, more get 503
     
     # GeoIP Configuration
     GEOIP_URL = "http://ip-api.com/json/{ip}"
 
+    # Observation store (trend history for favorite gridpoints)
+    OBSERVATION_CHUNK_SIZE = 256    # samples per stored chunk
+    OBSERVATION_MIN_INTERVAL = 600  # seconds between stored samples per gridpoint
+    # (resolution, max age) tiers in seconds. Data older than max age is
+    # downsampled to the next tier's resolution, the last tier is dropped.
+    OBSERVATION_RETENTION = (
+        (0, 2 * 86400),
+        (3600, 30 * 86400),
+        (86400, 365 * 86400),
+    )
+
+    # Rendered dashboard panels, keyed by gridpoint and upstream data version
+    FRAGMENT_CACHE_ENABLED = True
+    FRAGMENT_CACHE_SIZE = 512
+    FRAGMENT_CACHE_TTL = 900
+
+    # Compiled templates are kept on disk so new workers skip compilation.
+    # Defaults to <instance path>/jinja_cache when unset.
+    JINJA_BYTECODE_CACHE_DIR = os.environ.get('JINJA_BYTECODE_CACHE_DIR')
+
+    # Radar stations are resolved from the bundled NEXRAD table
+    RADAR_FALLBACK_COUNT = 2    # neighbouring stations offered if the nearest is down
+    RADAR_OVERRIDES_FILE = os.environ.get('RADAR_OVERRIDES_FILE')  # defaults to <instance path>/radar_overrides.json
+
+    # NWS active alerts, polled for all watched forecast zones together
+    # by a background thread in each app process
+    ALERT_POLLING_ENABLED = True
+    ALERT_POLL_INTERVAL = 120    # seconds between polling cycles
+    ALERT_ZONE_BATCH = 25        # zones per /alerts/active request
+    ALERT_ZONE_TTL = 6 * 3600    # stop watching zones nobody asked about for this long
+    ALERT_MAX_ZONES = 2000       # watched zones, least recently asked for dropped first
+    ALERT_MAX_LOCATIONS = 10000  # remembered location -> zone mappings
+
+    # Upstream concurrency limits: (max requests in flight, max waiting).
+    # Requests that cannot get a slot within UPSTREAM_QUEUE_TIMEOUT seconds
+    # are answered with 503 and Retry-After.
+    UPSTREAM_LIMITS = {
+        'nws': (8, 16),
+        'airnow': (4, 8),
+        'nominatim': (2, 4),
+    }
+    UPSTREAM_QUEUE_TIMEOUT = 2.0
+    UPSTREAM_RETRY_AFTER = 5
+
+    # Per-request profiling (see utils/profiling.py). Requests are profiled
+    # when they send a token from `flask profile-token`, when an admin adds
+    # ?_profile=1, or at random with PROFILE_SAMPLE_RATE (0.0 - 1.0).
+    PROFILING_ENABLED = os.environ.get('PROFILING_ENABLED', '').lower() in ('1', 'true', 'yes')
+    PROFILE_SAMPLE_RATE = float(os.environ.get('PROFILE_SAMPLE_RATE', 0.0))
+    PROFILE_INTERVAL = 0.005        # seconds between stack samples
+    PROFILE_KEEP = 100              # newest profiles kept on disk
+    PROFILE_TOKEN_MAX_AGE = 86400   # seconds a profile token stays valid
+    PROFILE_DIR = os.environ.get('PROFILE_DIR')  # defaults to <instance path>/profiles
+    PROFILE_ADMINS = [email.strip() for email in os.environ.get('PROFILE_ADMINS', '').split(',') if email.strip()]
+
 class DevelopmentConfig(Config):
     DEBUG = True
     TESTING = False
@@ -0,0 +1,29 @@
+# Project Gamma
+#
+# File: conftest.py
+# Version: 0.1
+# Date: 10/19/26
+#
+# Author: Ian Seymour / ian.seymour@cwu.edu
+#
+# Description:
+# Shared pytest fixtures: an application on an in-memory database.
+
+import pytest
+from app import create_app, db
+from config import TestingConfig
+
+
+@pytest.fixture
+def app(tmp_path):
+    class Config(TestingConfig):
+        WTF_CSRF_ENABLED = False
+        ALERT_POLLING_ENABLED = False
+        PROFILING_ENABLED = False
+        JINJA_BYTECODE_CACHE_DIR = str(tmp_path / 'jinja_cache')
+
+    app = create_app(Config)
+    with app.app_context():
+        yield app
+        db.session.remove()
+        db.drop_all()
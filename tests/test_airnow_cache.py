@@ -0,0 +1,146 @@
+# Project Gamma
+#
+# File: test_airnow_cache.py
+# Version: 0.1
+# Date: 10/19/26
+#
+# Author: Ian Seymour / ian.seymour@cwu.edu
+#
+# Description:
+# Tests for the AirNow reporting-area cache.
+
+import threading
+import pytest
+from app.utils.airnow_cache import AirQualityCache
+from app.utils.limiter import UpstreamBusy
+
+HOUR = 3600
+# 10:05, so the next update (20 minutes past) is 10:20
+NOW = 1799766000 - 1799766000 % HOUR + 300
+
+YAKIMA = {'ReportingArea': 'Yakima', 'StateCode': 'WA', 'Latitude': 46.6, 'Longitude': -120.51,
+          'AQI': 42, 'ParameterName': 'PM2.5'}
+
+
+@pytest.fixture
+def cache():
+    return AirQualityCache(grid=0.1, radius_km=25.0, update_offset=1200, hourly_quota=10, warn_ratio=0.8)
+
+
+def test_snap_to_grid(cache):
+    assert cache.snap(46.6049, -120.5149) == (46.6, -120.5)
+    assert cache.snap(46.66, -120.46) == (46.7, -120.5)
+
+
+def test_next_update(cache):
+    hour = NOW - NOW % HOUR
+    assert cache.next_update(hour) == hour + 1200
+    assert cache.next_update(hour + 1199) == hour + 1200
+    assert cache.next_update(hour + 1200) == hour + HOUR + 1200
+    assert cache.next_update(hour + 3000) == hour + HOUR + 1200
+
+
+def test_miss_then_hit_until_next_update(cache):
+    assert cache.lookup(46.6, -120.51, now=NOW) == (False, None, None)
+    cache.store(46.6, -120.51, YAKIMA, now=NOW)
+
+    expires = cache.next_update(NOW)
+    assert cache.lookup(46.6, -120.51, now=expires - 1) == (True, YAKIMA, None)
+    # After the update the old value is only offered as stale
+    assert cache.lookup(46.6, -120.51, now=expires) == (False, None, YAKIMA)
+
+
+def test_nearby_location_maps_to_known_area(cache):
+    cache.store(46.6, -120.51, YAKIMA, now=NOW)
+    # ~11 km away, a different grid cell in the same reporting area
+    assert cache.lookup(46.7, -120.45, now=NOW) == (True, YAKIMA, None)
+    # Seattle is far outside the radius
+    assert cache.lookup(47.6, -122.3, now=NOW) == (False, None, None)
+
+
+def test_area_refresh_updates_every_cell(cache):
+    cache.store(46.6, -120.51, YAKIMA, now=NOW)
+    cache.lookup(46.7, -120.45, now=NOW)
+    later = NOW + HOUR
+    newer = dict(YAKIMA, AQI=60)
+    cache.store(46.6, -120.51, newer, now=later)
+    assert cache.lookup(46.7, -120.45, now=later) == (True, newer, None)
+
+
+def test_empty_result_is_cached_until_next_update(cache):
+    cache.store(47.6, -122.3, None, now=NOW)
+    assert cache.lookup(47.6, -122.3, now=NOW) == (True, None, None)
+    assert cache.lookup(47.6, -122.3, now=cache.next_update(NOW)) == (False, None, None)
+
+
+def test_quota_reserve_and_refund(cache, caplog):
+    for _ in range(7):
+        assert cache.reserve_call(now=NOW)
+    assert 'quota' not in caplog.text
+    assert cache.reserve_call(now=NOW)
+    assert 'AirNow quota at 8/10' in caplog.text
+
+    assert cache.reserve_call(now=NOW)
+    assert cache.reserve_call(now=NOW)
+    assert not cache.reserve_call(now=NOW)
+
+    cache.refund_call(now=NOW)
+    assert cache.reserve_call(now=NOW)
+    assert not cache.reserve_call(now=NOW)
+
+    # A new hour starts a new quota, and refunds never go below zero
+    assert cache.reserve_call(now=NOW + HOUR)
+    cache.refund_call(now=NOW + HOUR)
+    cache.refund_call(now=NOW + HOUR)
+    assert cache.quota_used == 0
+
+
+def test_fetch_key_prefers_known_area(cache):
+    assert cache.fetch_key(46.7, -120.45) == cache.snap(46.7, -120.45)
+    cache.store(46.6, -120.51, YAKIMA, now=NOW)
+    cache.lookup(46.7, -120.45, now=NOW)
+    assert cache.fetch_key(46.7, -120.45) == 'Yakima|WA'
+
+
+def test_single_flight(cache):
+    assert cache.claim('Yakima|WA') is None
+    fetch = cache.claim('Yakima|WA')
+    assert fetch is not None
+    assert cache.waiting == 1
+    # Other keys are fetched independently
+    assert cache.claim('Seattle|WA') is None
+
+    results = []
+    waiter = threading.Thread(target=lambda: results.append(cache.wait(fetch)))
+    waiter.start()
+    cache.release('Yakima|WA')
+    waiter.join(timeout=5)
+
+    assert results == [True]
+    assert cache.waiting == 0
+    assert cache.claim('Yakima|WA') is None
+
+
+def test_single_flight_reports_shed_leader(cache):
+    cache.claim('Yakima|WA')
+    fetch = cache.claim('Yakima|WA')
+    cache.release('Yakima|WA', shed=True)
+    assert cache.wait(fetch) is False
+
+
+def test_single_flight_wait_times_out(cache):
+    cache.wait_timeout = 0.01
+    cache.claim('Yakima|WA')
+    assert cache.wait(cache.claim('Yakima|WA')) is False
+    assert cache.waiting == 0
+
+
+def test_waiters_are_capped(cache):
+    cache.max_waiters = 2
+    cache.claim('Yakima|WA')
+    cache.claim('Yakima|WA')
+    cache.claim('Yakima|WA')
+    with pytest.raises(UpstreamBusy):
+        cache.claim('Yakima|WA')
+    # The cap is across keys, a new key still gets to lead its own fetch
+    assert cache.claim('Seattle|WA') is None
@@ -0,0 +1,152 @@
+# Project Gamma
+#
+# File: test_alerts.py
+# Version: 0.1
+# Date: 10/19/26
+#
+# Author: Ian Seymour / ian.seymour@cwu.edu
+#
+# Description:
+# Tests for the zone-batched alert monitor.
+
+from app.utils.alerts import AlertMonitor
+
+
+def make_alert(alert_id, zones, sent='2026-01-15T06:00:00-08:00'):
+    return {'properties': {'id': alert_id, 'event': 'Winter Storm Warning', 'sent': sent,
+                           'geocode': {'UGC': list(zones)}}}
+
+
+class FakeWeatherAPI:
+    """Answers /alerts/active from a fixed list of alerts, like NWS does per zone batch."""
+
+    def __init__(self, alerts, failing=()):
+        self.alerts = alerts
+        self.failing = set(failing)
+        self.batches = []
+
+    def get_active_alerts(self, zones):
+        zones = list(zones)
+        self.batches.append(zones)
+        if self.failing & set(zones):
+            return None
+        return [a for a in self.alerts if set(a['properties']['geocode']['UGC']) & set(zones)]
+
+
+def test_zones_are_polled_in_batches():
+    monitor = AlertMonitor(batch_size=2)
+    for zone in ('WAZ001', 'WAZ002', 'WAZ003'):
+        monitor.watch(zone)
+    api = FakeWeatherAPI([])
+    monitor.poll(api)
+    assert api.batches == [['WAZ001', 'WAZ002'], ['WAZ003']]
+
+
+def test_alert_spanning_two_batches_is_listed_once_per_zone():
+    monitor = AlertMonitor(batch_size=2)
+    for zone in ('WAZ001', 'WAZ002', 'WAZ003'):
+        monitor.watch(zone)
+    api = FakeWeatherAPI([make_alert('storm', ['WAZ001', 'WAZ003'])])
+
+    diff = monitor.poll(api)
+
+    assert len(api.batches) == 2
+    assert [a['id'] for a in monitor.alerts['WAZ001']] == ['storm']
+    assert [a['id'] for a in monitor.alerts['WAZ003']] == ['storm']
+    assert monitor.alerts['WAZ002'] == []
+    assert diff['added'] == ['storm']
+
+
+def test_poll_diffs_against_previous_cycle():
+    monitor = AlertMonitor()
+    monitor.watch('WAZ001')
+    monitor.poll(FakeWeatherAPI([make_alert('a', ['WAZ001']), make_alert('b', ['WAZ001'])]))
+
+    diff = monitor.poll(FakeWeatherAPI([make_alert('b', ['WAZ001'], sent='later'),
+                                        make_alert('c', ['WAZ001'])]))
+    assert diff == {'added': ['c'], 'updated': ['b'], 'removed': ['a']}
+
+
+def test_failed_batch_keeps_previous_alerts():
+    monitor = AlertMonitor()
+    monitor.watch('WAZ001')
+    monitor.poll(FakeWeatherAPI([make_alert('a', ['WAZ001'])]))
+    monitor.poll(FakeWeatherAPI([], failing=['WAZ001']))
+    assert [a['id'] for a in monitor.alerts['WAZ001']] == ['a']
+
+
+def test_watch_lists_are_bounded():
+    monitor = AlertMonitor(max_zones=2, max_locations=2)
+    for i, zone in enumerate(('WAZ001', 'WAZ002', 'WAZ003')):
+        monitor.remember_zone(46 + i, -120, zone)
+    assert list(monitor.zones) == ['WAZ002', 'WAZ003']
+    assert len(monitor.location_zones) == 2
+
+
+def test_unused_zones_expire():
+    monitor = AlertMonitor(zone_ttl=100)
+    monitor.watch('WAZ001')
+    monitor.poll(FakeWeatherAPI([]))
+    assert monitor.expire(now=monitor.zones['WAZ001'] + 101) == 1
+    assert 'WAZ001' not in monitor.zones
+    assert 'WAZ001' not in monitor.alerts
+
+
+def test_unpolled_zone_is_fetched_once_in_the_request():
+    monitor = AlertMonitor()
+    api = FakeWeatherAPI([make_alert('storm', ['WAZ001'])])
+
+    assert [a['id'] for a in monitor.alerts_for('WAZ001', api)] == ['storm']
+    assert [a['id'] for a in monitor.alerts_for('WAZ001', api)] == ['storm']
+    assert api.batches == [['WAZ001']]
+    assert monitor.pending == set()
+
+
+def test_unknown_zone_is_not_reported_as_clear():
+    monitor = AlertMonitor()
+    # Without an API the poller is asked to fetch it
+    assert monitor.alerts_for('WAZ001') is None
+    assert monitor.pending == {'WAZ001'}
+
+    api = FakeWeatherAPI([], failing=['WAZ002'])
+    assert monitor.alerts_for('WAZ002', api) is None
+    # A failed zone waits for the next cycle instead of costing every request a fetch
+    assert monitor.alerts_for('WAZ002', api) is None
+    assert api.batches == [['WAZ002']]
+    assert 'WAZ002' in monitor.failed
+
+    api.failing.clear()
+    monitor.refresh(api, force=True)
+    assert monitor.alerts_for('WAZ002', api) == []
+    assert 'WAZ002' not in monitor.failed
+
+
+class FakeZoneAPI(FakeWeatherAPI):
+    def __init__(self, zones):
+        super().__init__([])
+        self.zones = zones
+        self.points_calls = 0
+
+    def get_forecast_zone(self, latitude, longitude):
+        self.points_calls += 1
+        return self.zones.get((latitude, longitude))
+
+
+def test_favorites_are_seeded(app):
+    from app import db
+    from app.models import User, Favorite
+    user = User(email='seed@example.com', password_hash='x')
+    db.session.add(user)
+    db.session.commit()
+    for city, lat, lon in (('A', 46.99, -120.54), ('B', 46.99, -120.54), ('C', 47.6, -122.3)):
+        db.session.add(Favorite(user_id=user.id, city=city, latitude=lat, longitude=lon))
+    db.session.commit()
+
+    monitor = AlertMonitor()
+    api = FakeZoneAPI({(46.99, -120.54): 'WAZ026', (47.6, -122.3): 'WAZ558'})
+    assert monitor.seed_favorites(api) == 2
+    assert monitor.pending == {'WAZ026', 'WAZ558'}
+
+    # Locations are only resolved once
+    monitor.seed_favorites(api)
+    assert api.points_calls == 2
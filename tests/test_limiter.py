@@ -0,0 +1,121 @@
+# Project Gamma
+#
+# File: test_limiter.py
+# Version: 0.1
+# Date: 10/19/26
+#
+# Author: Ian Seymour / ian.seymour@cwu.edu
+#
+# Description:
+# Tests for the per-upstream concurrency limiter.
+
+import threading
+import time
+import pytest
+from app.utils.limiter import (UpstreamLimiter, UpstreamBusy,
+                               PRIORITY_INTERACTIVE, PRIORITY_BACKGROUND)
+
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not met in time")
+        time.sleep(0.005)
+
+
+def start_waiter(limiter, priority, order):
+    """Queue a thread for a slot that records when it gets one and releases it."""
+    def run():
+        with limiter.slot(priority):
+            order.append(priority)
+    thread = threading.Thread(target=run)
+    queued = len(limiter._waiting)
+    thread.start()
+    wait_for(lambda: len(limiter._waiting) == queued + 1)
+    return thread
+
+
+def test_acquire_without_waiting_while_slots_free():
+    limiter = UpstreamLimiter('nws', max_concurrent=2, max_queue=2)
+    limiter.acquire()
+    limiter.acquire()
+    assert limiter.active == 2
+    limiter.release()
+    limiter.release()
+    assert limiter.active == 0
+
+
+def test_interactive_waiters_go_before_background():
+    limiter = UpstreamLimiter('nws', max_concurrent=1, max_queue=8, timeout=5)
+    order = []
+    limiter.acquire()
+    threads = [
+        start_waiter(limiter, PRIORITY_BACKGROUND, order),
+        start_waiter(limiter, PRIORITY_INTERACTIVE, order),
+        start_waiter(limiter, PRIORITY_BACKGROUND, order),
+        start_waiter(limiter, PRIORITY_INTERACTIVE, order),
+    ]
+    limiter.release()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert order == [PRIORITY_INTERACTIVE, PRIORITY_INTERACTIVE,
+                     PRIORITY_BACKGROUND, PRIORITY_BACKGROUND]
+    assert limiter.active == 0
+
+
+def test_full_queue_raises_busy_immediately():
+    limiter = UpstreamLimiter('nws', max_concurrent=1, max_queue=1, timeout=5, retry_after=7)
+    order = []
+    limiter.acquire()
+    thread = start_waiter(limiter, PRIORITY_INTERACTIVE, order)
+
+    started = time.monotonic()
+    with pytest.raises(UpstreamBusy) as excinfo:
+        limiter.acquire(PRIORITY_INTERACTIVE)
+    assert time.monotonic() - started < 1
+    assert excinfo.value.upstream == 'nws'
+    assert excinfo.value.retry_after == 7
+
+    limiter.release()
+    thread.join(timeout=5)
+    assert order == [PRIORITY_INTERACTIVE]
+
+
+def test_waiter_times_out_and_leaves_queue():
+    limiter = UpstreamLimiter('nws', max_concurrent=1, max_queue=2, timeout=0.05)
+    limiter.acquire()
+    with pytest.raises(UpstreamBusy):
+        limiter.acquire()
+    assert limiter._waiting == []
+    assert limiter.active == 1
+
+    limiter.release()
+    limiter.acquire()
+    assert limiter.active == 1
+
+
+def test_background_only_uses_half_the_queue():
+    limiter = UpstreamLimiter('nws', max_concurrent=1, max_queue=4, timeout=5)
+    order = []
+    limiter.acquire()
+    threads = [start_waiter(limiter, PRIORITY_BACKGROUND, order) for _ in range(2)]
+
+    with pytest.raises(UpstreamBusy):
+        limiter.acquire(PRIORITY_BACKGROUND)
+    # Interactive requests can still queue behind the background jobs
+    threads.append(start_waiter(limiter, PRIORITY_INTERACTIVE, order))
+
+    limiter.release()
+    for thread in threads:
+        thread.join(timeout=5)
+    assert order == [PRIORITY_INTERACTIVE, PRIORITY_BACKGROUND, PRIORITY_BACKGROUND]
+
+
+def test_slot_releases_on_error():
+    limiter = UpstreamLimiter('nws', max_concurrent=1, max_queue=1)
+    with pytest.raises(RuntimeError):
+        with limiter.slot():
+            raise RuntimeError("upstream failed")
+    assert limiter.active == 0
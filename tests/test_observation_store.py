@@ -0,0 +1,116 @@
+# Project Gamma
+#
+# File: test_observation_store.py
+# Version: 0.1
+# Date: 10/19/26
+#
+# Author: Ian Seymour / ian.seymour@cwu.edu
+#
+# Description:
+# Tests for the columnar observation store.
+
+from array import array
+import pytest
+from app.models import ObservationChunk
+from app.utils.observation_store import ObservationStore
+
+GRID = 'PDT/43,99'
+HOUR = 3600
+# An hour boundary, so bucket edges in the tests are easy to read
+BASE = 1799766000 - 1799766000 % HOUR
+
+
+@pytest.fixture
+def store(app):
+    app.config['OBSERVATION_CHUNK_SIZE'] = 4
+    app.config['OBSERVATION_MIN_INTERVAL'] = 600
+    app.config['OBSERVATION_RETENTION'] = ((0, 2 * 86400), (HOUR, 30 * 86400), (86400, 365 * 86400))
+    return ObservationStore()
+
+
+def test_append_skips_samples_within_min_interval(store):
+    assert store.append(GRID, temperature=40, timestamp=BASE)
+    assert not store.append(GRID, temperature=41, timestamp=BASE + 599)
+    assert store.append(GRID, temperature=42, timestamp=BASE + 600)
+
+    data = store.read(GRID, BASE, BASE + HOUR)
+    assert list(data['timestamp']) == [BASE, BASE + 600]
+    assert list(data['temperature']) == [40, 42]
+
+
+def test_append_starts_new_chunk_when_full(store):
+    for i in range(6):
+        store.append(GRID, temperature=i, timestamp=BASE + i * 900)
+    counts = [c.count for c in ObservationChunk.query.order_by(ObservationChunk.start_ts)]
+    assert counts == [4, 2]
+
+
+def test_read_spans_chunks_of_mixed_resolution(store):
+    for i in range(40):
+        store.append(GRID, temperature=i, aqi=i * 2, timestamp=BASE + i * 900)
+    # Roll the first 8 hours into hourly chunks, the rest stays raw
+    store.compact(now=BASE + 8 * HOUR + 2 * 86400)
+    assert {c.resolution for c in ObservationChunk.query} == {0, HOUR}
+
+    data = store.read(GRID, BASE, BASE + 40 * 900)
+    timestamps = list(data['timestamp'])
+    assert timestamps == sorted(timestamps)
+    assert timestamps[:8] == [BASE + h * HOUR for h in range(8)]
+    assert timestamps[8:] == [BASE + i * 900 for i in range(32, 40)]
+    assert data['temperature'][0] == 1.5
+    assert data['aqi'][0] == 3.0
+
+    # Range limits apply inside chunks too
+    part = store.read(GRID, BASE + HOUR, BASE + 2 * HOUR)
+    assert list(part['timestamp']) == [BASE + HOUR, BASE + 2 * HOUR]
+
+
+def test_missing_values_are_stored_as_nan(store):
+    store.append(GRID, temperature=None, dewpoint='n/a', timestamp=BASE)
+    data = store.read(GRID, BASE, BASE)
+    assert data['temperature'][0] != data['temperature'][0]
+    assert data['dewpoint'][0] != data['dewpoint'][0]
+
+
+def test_aggregate_skips_empty_buckets(store):
+    store.append(GRID, temperature=10, timestamp=BASE)
+    store.append(GRID, temperature=20, timestamp=BASE + 1000)
+    store.append(GRID, temperature=30, timestamp=BASE + 365 * 86400)
+
+    buckets = store.aggregate(GRID, BASE, BASE + 365 * 86400, bucket=1, func='max')
+    assert [b['timestamp'] for b in buckets] == [BASE, BASE + 1000, BASE + 365 * 86400]
+
+    hourly = store.aggregate(GRID, BASE, BASE + 365 * 86400, bucket=HOUR)
+    assert [(b['timestamp'], b['temperature']) for b in hourly] == [(BASE, 15), (BASE + 365 * 86400, 30)]
+    assert hourly[0]['aqi'] is None
+
+
+def test_repeated_compaction_writes_each_bucket_once(store):
+    for i in range(40):
+        store.append(GRID, temperature=i, timestamp=BASE + i * 900)
+
+    # Each run cuts through the middle of an hour
+    for step in (5, 13, 22, 30, 41):
+        store.compact(now=BASE + step * 900 + 2 * 86400 + 1)
+        hourly = (ObservationChunk.query
+                  .filter_by(grid_id=GRID, resolution=HOUR)
+                  .order_by(ObservationChunk.start_ts)
+                  .all())
+        data = store.read(GRID, BASE, BASE + 40 * 900)
+        timestamps = list(data['timestamp'])
+        assert len(timestamps) == len(set(timestamps))
+        assert timestamps == sorted(timestamps)
+        edges = [t for chunk in hourly for t in array('q', chunk.timestamps)]
+        assert len(edges) == len(set(edges))
+
+    # Everything has been rolled up into ten hourly means of four samples
+    data = store.read(GRID, BASE, BASE + 40 * 900)
+    assert list(data['timestamp']) == [BASE + h * HOUR for h in range(10)]
+    assert list(data['temperature']) == [h * 4 + 1.5 for h in range(10)]
+
+
+def test_compaction_drops_data_past_last_tier(store):
+    store.append(GRID, temperature=1, timestamp=BASE)
+    store.compact(now=BASE + 400 * 86400)
+    store.compact(now=BASE + 800 * 86400)
+    assert ObservationChunk.query.count() == 0
@@ -0,0 +1,63 @@
+# Project Gamma
+#
+# File: test_radar_stations.py
+# Version: 0.1
+# Date: 10/19/26
+#
+# Author: Ian Seymour / ian.seymour@cwu.edu
+#
+# Description:
+# Tests for the local radar station KD-tree.
+
+import random
+import pytest
+from app.utils.radar_stations import RadarStationIndex, get_station_index, haversine_km
+
+
+def brute_force(index, latitude, longitude, k):
+    ranked = sorted(index.stations,
+                    key=lambda s: haversine_km(latitude, longitude, s['latitude'], s['longitude']))
+    return [s['station_id'] for s in ranked[:k]]
+
+
+def test_bundled_table_loads():
+    index = get_station_index()
+    assert len(index.stations) > 150
+    assert index.nearest(46.9965, -120.5478)[0]['station_id'] == 'KPDT'
+
+
+@pytest.mark.parametrize('k', [1, 3])
+def test_matches_brute_force_haversine(k):
+    index = get_station_index()
+    rng = random.Random(1234)
+    for _ in range(1000):
+        # Continental US plus Alaska, Hawaii and the territories
+        latitude = rng.uniform(10, 72)
+        longitude = rng.uniform(-180, -60)
+        found = [s['station_id'] for s in index.nearest(latitude, longitude, k)]
+        assert found == brute_force(index, latitude, longitude, k), (latitude, longitude)
+
+
+def test_results_are_sorted_with_distances():
+    stations = get_station_index().nearest(40.0, -100.0, k=5)
+    distances = [s['distance_km'] for s in stations]
+    assert distances == sorted(distances)
+
+
+@pytest.mark.parametrize('k', [0, -1])
+def test_non_positive_k_returns_nothing(k):
+    assert get_station_index().nearest(40.0, -100.0, k=k) == []
+
+
+def test_k_larger_than_table():
+    index = RadarStationIndex([
+        {'station_id': 'KAAA', 'name': 'A', 'state': 'WA', 'latitude': 47.0, 'longitude': -120.0},
+        {'station_id': 'KBBB', 'name': 'B', 'state': 'WA', 'latitude': 48.0, 'longitude': -121.0},
+    ])
+    assert [s['station_id'] for s in index.nearest(47.1, -120.1, k=5)] == ['KAAA', 'KBBB']
+
+
+def test_distance_to():
+    index = get_station_index()
+    assert index.distance_to('KPDT', 46.9965, -120.5478) > 0
+    assert index.distance_to('NOPE', 46.9965, -120.5478) is None
@@ -0,0 +1,99 @@
+# Project Gamma
+#
+# File: test_responses.py
+# Version: 0.1
+# Date: 10/19/26
+#
+# Author: Ian Seymour / ian.seymour@cwu.edu
+#
+# Description:
+# Tests for field projection and content negotiation.
+
+import json
+import msgpack
+import pytest
+from app.utils.responses import (project, negotiate, encoded_response, parse_fields, FieldError,
+                                 MIMETYPE_JSON, MIMETYPE_MSGPACK, MIMETYPE_COMPACT)
+
+DATA = {
+    'current': {'temperature': 41, 'icon': 'sct', 'wind': {'speed': '5 mph'}},
+    'high_temp': 48,
+    'low_temp': 30,
+}
+
+
+def test_parse_fields():
+    assert parse_fields(None) is None
+    assert parse_fields(' , ') is None
+    assert parse_fields('high_temp, current.icon,') == ['high_temp', 'current.icon']
+
+
+def test_project_keeps_nested_shape():
+    assert project(DATA, ['current.temperature', 'current.wind.speed', 'low_temp']) == {
+        'current': {'temperature': 41, 'wind': {'speed': '5 mph'}},
+        'low_temp': 30,
+    }
+
+
+def test_project_unknown_field_raises():
+    with pytest.raises(FieldError):
+        project(DATA, ['current.humidity'])
+    with pytest.raises(FieldError):
+        project(DATA, ['high_temp.value'])
+
+
+@pytest.mark.parametrize('accept, expected', [
+    (None, MIMETYPE_JSON),
+    ('*/*', MIMETYPE_JSON),
+    ('application/msgpack', MIMETYPE_MSGPACK),
+    ('application/x-msgpack', MIMETYPE_MSGPACK),
+    ('application/vnd.gamma.compact+json', MIMETYPE_COMPACT),
+    ('application/json;q=0.5, application/msgpack', MIMETYPE_MSGPACK),
+    ('text/html', MIMETYPE_JSON),
+])
+def test_negotiate(app, accept, expected):
+    headers = {'Accept': accept} if accept else {}
+    with app.test_request_context('/', headers=headers):
+        assert negotiate() == expected
+
+
+def test_unknown_field_is_400(app):
+    with app.test_request_context('/'):
+        response, status = encoded_response(DATA, ['nope'])
+    assert status == 400
+    assert 'nope' in response.get_json()['error']
+
+
+def test_json_projection(app):
+    with app.test_request_context('/'):
+        response = encoded_response(DATA, ['high_temp'])
+    assert response.mimetype == MIMETYPE_JSON
+    assert response.get_json() == {'high_temp': 48}
+    assert 'Accept' in response.vary
+
+
+def test_compact_keeps_field_order(app):
+    headers = {'Accept': MIMETYPE_COMPACT}
+    with app.test_request_context('/', headers=headers):
+        response = encoded_response(DATA, ['low_temp', 'current.temperature', 'high_temp'])
+    assert json.loads(response.get_data()) == [30, 41, 48]
+    assert response.headers['X-Fields'] == 'low_temp,current.temperature,high_temp'
+
+    with app.test_request_context('/', headers=headers):
+        response = encoded_response(DATA)
+    assert response.headers['X-Fields'] == 'current,high_temp,low_temp'
+    assert json.loads(response.get_data())[1:] == [48, 30]
+
+
+def test_msgpack(app):
+    with app.test_request_context('/', headers={'Accept': 'application/x-msgpack'}):
+        response = encoded_response(DATA, ['current.icon', 'high_temp'])
+    assert response.mimetype == MIMETYPE_MSGPACK
+    assert msgpack.unpackb(response.get_data()) == {'current': {'icon': 'sct'}, 'high_temp': 48}
+
+
+def test_msgpack_missing_is_406(app, monkeypatch):
+    monkeypatch.setattr('app.utils.responses.msgpack', None)
+    with app.test_request_context('/', headers={'Accept': MIMETYPE_MSGPACK}):
+        response, status = encoded_response(DATA)
+    assert status == 406